@@ -1,14 +1,21 @@
 #!/bin/bash
 set -e
 
-if [ -z "$PYPI_URL" ]; then
+# Written by the Dockerfile when the service is installed at build time.
+PREINSTALLED_MARKER="/app/.preinstalled"
+
+if [ -f "$PREINSTALLED_MARKER" ] && { [ -z "$PYPI_URL" ] || [ "$PYPI_URL" = "$(cat "$PREINSTALLED_MARKER")" ]; }; then
+    # Pre-installed image mode: nothing to install, start serving right away.
+    echo "Using service pre-installed from $(cat "$PREINSTALLED_MARKER")."
+elif [ -z "$PYPI_URL" ]; then
     echo "Error: PYPI_URL environment variable is not set."
     exit 1
+else
+    # PIP_FIND_LINKS/PIP_NO_INDEX let pip install from a mounted directory of prebuilt wheels.
+    echo "Installing service from $PYPI_URL..."
+    pip install --no-cache-dir --disable-pip-version-check "$PYPI_URL"
 fi
 
-echo "Installing service from $PYPI_URL..."
-pip install "$PYPI_URL"
-
 # Determine the module to run
 if [ -z "$PYPY_MODEL" ]; then
     # Try to extract from URL (basic heuristic, might need adjustment based on actual URL format)
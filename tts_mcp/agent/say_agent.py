@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# agent/say_agent.py
+
+"""A small synthesis daemon to run on the Mac.
+
+The tts_mcp server reaches it through a direct-tcpip channel on its existing
+SSH connection, so the agent only needs to listen on localhost:
+
+    python3 say_agent.py --port 7777 --warm-voices Samantha,Daniel
+
+With PyObjC installed (`pip3 install pyobjc-framework-Cocoa`) it keeps
+NSSpeechSynthesizer instances loaded per voice between requests; otherwise it
+runs `say` itself, which still saves the per-request SSH exec and shell.
+Only the standard library is needed besides that, so the file can be copied
+to the Mac on its own.
+
+Protocol: every frame is a 4-byte big-endian length followed by the payload.
+The client sends a JSON request frame ({"text", "voice", "rate"}); the agent
+answers with a JSON header frame ({"ok": true, "length": n} or
+{"ok": false, "error": "..."}) followed, on success, by n bytes of AIFF. A
+connection may carry any number of requests.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socketserver
+import struct
+import subprocess
+import tempfile
+import threading
+
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+def read_frame(rfile) -> bytes:
+    header = rfile.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise ConnectionError("Connection closed inside a frame header")
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit")
+    payload = rfile.read(length)
+    if len(payload) < length:
+        raise ConnectionError("Connection closed inside a frame")
+    return payload
+
+def write_frame(wfile, payload: bytes) -> None:
+    wfile.write(FRAME_HEADER.pack(len(payload)) + payload)
+    wfile.flush()
+
+class SayEngine:
+    """Render with the `say` command line tool."""
+
+    name = "say"
+
+    def warm(self, voices: list[str]) -> None:
+        pass
+
+    def render(self, text: str, voice: str, rate: int, path: str) -> None:
+        command = ["say", "-f", "-", "-o", path]
+        if voice:
+            command += ["-v", voice]
+        if rate:
+            command += ["-r", str(int(rate))]
+        result = subprocess.run(command, input=text.encode("utf-8"), capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"say exited with status {result.returncode}: {result.stderr.decode('utf-8', 'replace').strip()}")
+
+class AppKitEngine:
+    """Render with NSSpeechSynthesizer, keeping idle synthesizers per voice so voices stay loaded."""
+
+    name = "appkit"
+
+    def __init__(self) -> None:
+        from AppKit import NSSpeechSynthesizer
+        from Foundation import NSDate, NSRunLoop, NSURL
+        self._synthesizer = NSSpeechSynthesizer
+        self._date = NSDate
+        self._run_loop = NSRunLoop
+        self._url = NSURL
+        self._lock = threading.Lock()
+        self._idle: dict[str, list] = {}
+        # `say -v` takes voice names; NSSpeechSynthesizer wants identifiers.
+        self._voices = {}
+        for identifier in NSSpeechSynthesizer.availableVoices():
+            name = NSSpeechSynthesizer.attributesForVoice_(identifier).get("VoiceName")
+            if name:
+                self._voices[str(name).lower()] = identifier
+
+    def _identifier(self, voice: str):
+        if not voice:
+            return None
+        identifier = self._voices.get(voice.lower())
+        if identifier is None and voice not in self._voices.values():
+            raise ValueError(f"Unknown voice '{voice}'")
+        return identifier or voice
+
+    def _checkout(self, voice: str):
+        with self._lock:
+            idle = self._idle.get(voice)
+            if idle:
+                return idle.pop()
+        synthesizer = self._synthesizer.alloc().initWithVoice_(self._identifier(voice))
+        if synthesizer is None:
+            raise RuntimeError(f"Failed to load voice '{voice}'")
+        # Remember the voice's own rate so a request without one can restore it.
+        return synthesizer, synthesizer.rate()
+
+    def _checkin(self, voice: str, entry: tuple) -> None:
+        with self._lock:
+            self._idle.setdefault(voice, []).append(entry)
+
+    def warm(self, voices: list[str]) -> None:
+        for voice in voices:
+            self._checkin(voice, self._checkout(voice))
+
+    def render(self, text: str, voice: str, rate: int, path: str) -> None:
+        voice = voice or ""
+        entry = self._checkout(voice)
+        synthesizer, default_rate = entry
+        try:
+            synthesizer.setRate_(float(rate) if rate else default_rate)
+            if not synthesizer.startSpeakingString_toURL_(text, self._url.fileURLWithPath_(path)):
+                raise RuntimeError("NSSpeechSynthesizer refused the request")
+            # Rendering to a file finishes on the run loop of this thread.
+            run_loop = self._run_loop.currentRunLoop()
+            while synthesizer.isSpeaking():
+                run_loop.runUntilDate_(self._date.dateWithTimeIntervalSinceNow_(0.01))
+        finally:
+            self._checkin(voice, entry)
+
+def make_engine(name: str):
+    if name in ("auto", "appkit"):
+        try:
+            return AppKitEngine()
+        except ImportError:
+            if name == "appkit":
+                raise
+    return SayEngine()
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                frame = read_frame(self.rfile)
+            except (ConnectionError, ValueError):
+                return
+            if frame is None:
+                return
+            fd, path = tempfile.mkstemp(prefix="say-agent-", suffix=".aiff", dir=self.server.working_path)
+            os.close(fd)
+            try:
+                request = json.loads(frame)
+                self.server.engine.render(request["text"], request.get("voice"), request.get("rate"), path)
+                write_frame(self.wfile, json.dumps({"ok": True, "length": os.path.getsize(path)}).encode())
+                with open(path, "rb") as audio:
+                    shutil.copyfileobj(audio, self.wfile, 256 * 1024)
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                write_frame(self.wfile, json.dumps({"ok": False, "error": str(e)}).encode())
+            finally:
+                os.remove(path)
+
+class AgentServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], engine, working_path: str = None) -> None:
+        super().__init__(address, _Handler)
+        self.engine = engine
+        self.working_path = working_path
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve speech synthesis to tts_mcp over an SSH-forwarded local port.")
+    parser.add_argument("--host", default="127.0.0.1", help="Keep this on localhost; the server connects through SSH.")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--engine", choices=["auto", "appkit", "say"], default="auto")
+    parser.add_argument("--warm-voices", default="", help="Comma-separated voices to load at startup; an empty name is the system voice.")
+    parser.add_argument("--working-path", default=None, help="Directory for the temporary audio files.")
+    args = parser.parse_args()
+
+    engine = make_engine(args.engine)
+    engine.warm([""] + [voice.strip() for voice in args.warm_voices.split(",") if voice.strip()])
+    server = AgentServer((args.host, args.port), engine, args.working_path)
+    print(f"say_agent listening on {args.host}:{args.port} ({engine.name} engine)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# benchmarks/bench.py
+
+"""Offline throughput/latency benchmark for the say pipeline.
+
+Runs tts_mcp against a local fake Mac (benchmarks/fake_mac.py) and an S3
+stand-in, so no real Mac or MinIO is needed:
+
+    pip install -e ".[bench]"
+    python benchmarks/bench.py --concurrency 1 4 16 --text-chars 100 2000 --hit-ratio 0 0.5 --output results.json
+
+The say scenario sends the text with each request; the tts scenario uploads
+it to the S3 stand-in first and passes its URL, as MinIO clients do.
+
+With --s3-endpoint the benchmark uses an existing MinIO instead of starting an
+in-process moto server. Results are written as JSON so that runs can be
+compared over time.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "agent"))
+
+from fake_mac import FakeMac, FakeSayEngine
+
+def _start_s3() -> tuple[str, object]:
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        raise SystemExit("moto is not installed; install the 'bench' extra or pass --s3-endpoint for a local MinIO.")
+    # Keep moto's per-request access log out of the results.
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    return f"{host}:{port}", server
+
+def _start_agent(mac: FakeMac) -> tuple[int, object]:
+    from say_agent import AgentServer
+    server = AgentServer(("127.0.0.1", 0), FakeSayEngine(mac), mac.root)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server
+
+def _configure(args: argparse.Namespace, mac_port: int, s3_endpoint: str, agent_port: int = 0) -> None:
+    # tts_mcp reads its settings from the environment at import time.
+    os.environ.update({
+        "ENV_FILE": os.devnull,
+        "LOG_LEVEL": "WARNING",
+        "MAC_HOST": "127.0.0.1",
+        "MAC_HOSTS": "",
+        "MAC_PORT": str(mac_port),
+        "MAC_USER": "bench",
+        "MAC_PASSWORD": "bench",
+        "MAC_SSH_FILE": "",
+        "MAC_WORKING_PATH": "/tmp",
+        "MAC_POOL_SIZE": str(args.pool_size),
+        "MAC_AGENT_PORT": str(agent_port),
+        "MINIO_ENDPOINT": s3_endpoint,
+        "MINIO_ACCESS_KEY": args.s3_access_key,
+        "MINIO_SECRET_KEY": args.s3_secret_key,
+        "MINIO_SECURE": "false",
+        "MINIO_BUCKET": args.bucket,
+        "MINIO_WORKING_PATH": f"bench-{uuid.uuid4().hex[:8]}",
+        "MINIO_PUBLIC_URL": f"http://{s3_endpoint}",
+        "TTS_MAX_WORKERS": str(args.workers),
+        # Measure the MinIO path, not the local disk cache.
+        "TTS_LOCAL_CACHE_BYTES": "0",
+        "TTS_JOB_DB": os.path.join(tempfile.gettempdir(), f"tts-bench-jobs-{os.getpid()}.sqlite3"),
+    })
+
+def _percentile(values: list[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+def _text(chars: int) -> str:
+    # A unique prefix keeps separate runs and scenarios from hitting each other's cache entries.
+    sentence = "The quick brown fox jumps over the lazy dog. "
+    body = (sentence * (chars // len(sentence) + 1))[:chars]
+    return f"{uuid.uuid4().hex} {body}"
+
+def _upload_texts(texts: list[str]) -> list[str]:
+    from minio import Minio
+    client = Minio(os.environ["MINIO_ENDPOINT"], access_key=os.environ["MINIO_ACCESS_KEY"], secret_key=os.environ["MINIO_SECRET_KEY"], secure=False)
+    bucket = os.environ["MINIO_BUCKET"]
+    if not client.bucket_exists(bucket_name=bucket):
+        client.make_bucket(bucket_name=bucket)
+    urls = []
+    for text in texts:
+        data = text.encode("utf-8")
+        object_name = f"{os.environ['MINIO_WORKING_PATH']}/texts/{uuid.uuid4().hex}.txt"
+        client.put_object(bucket_name=bucket, object_name=object_name, data=io.BytesIO(data), length=len(data), content_type="text/plain; charset=utf-8")
+        urls.append(f"{os.environ['MINIO_PUBLIC_URL']}/{bucket}/{object_name}")
+    return urls
+
+async def _run_scenario(tools, scenario: str, concurrency: int, text_chars: int, hit_ratio: float, requests: int) -> dict:
+    hits = round(requests * hit_ratio)
+    warm_texts = [_text(text_chars) for _ in range(max(1, min(hits, concurrency)))] if hits else []
+    texts = [warm_texts[i % len(warm_texts)] for i in range(hits)] + [_text(text_chars) for _ in range(requests - hits)]
+    if scenario == "tts":
+        # Upload outside the timed window; a repeated text reuses its object, as a cache hit would.
+        unique = list(dict.fromkeys(texts))
+        urls = dict(zip(unique, _upload_texts(unique)))
+        request, inputs = tools.tts_async, [urls[text] for text in texts]
+        warm_inputs = [urls[text] for text in warm_texts]
+    else:
+        request, inputs, warm_inputs = tools.say_async, texts, warm_texts
+    # Warm the cache outside the timed window.
+    for value in warm_inputs:
+        await request(value)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(value: str) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await request(value)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(value) for value in inputs])
+    elapsed = time.perf_counter() - started
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "text_chars": text_chars,
+        "hit_ratio": hit_ratio,
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "rps": round(len(latencies) / elapsed, 3) if elapsed else 0,
+        "p50_s": round(_percentile(latencies, 50), 4) if latencies else None,
+        "p99_s": round(_percentile(latencies, 99), 4) if latencies else None,
+        "mean_s": round(statistics.fmean(latencies), 4) if latencies else None,
+    }
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the tts_mcp say pipeline against local SSH and S3 stand-ins.")
+    parser.add_argument("--scenario", nargs="+", choices=["say", "tts"], default=["say", "tts"], help="say sends the text, tts sends the URL of an uploaded text object.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--text-chars", type=int, nargs="+", default=[100, 2000])
+    parser.add_argument("--hit-ratio", type=float, nargs="+", default=[0.0, 0.5, 0.9])
+    parser.add_argument("--requests", type=int, default=32, help="Requests per scenario.")
+    parser.add_argument("--say-delay", type=float, default=0.2, help="Fixed fake say time in seconds.")
+    parser.add_argument("--say-per-char", type=float, default=0.0005, help="Extra fake say time per character.")
+    parser.add_argument("--audio-bytes-per-char", type=int, default=2000, help="Fake audio size per character.")
+    parser.add_argument("--agent", action="store_true", help="Synthesize through agent/say_agent.py instead of SSH exec.")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--s3-endpoint", default="", help="Use this MinIO/S3 endpoint instead of starting moto.")
+    parser.add_argument("--s3-access-key", default="testing")
+    parser.add_argument("--s3-secret-key", default="testing")
+    parser.add_argument("--bucket", default="tts-bench")
+    parser.add_argument("--output", default="", help="Write results to this JSON file.")
+    args = parser.parse_args()
+
+    logging.getLogger("paramiko").setLevel(logging.WARNING)
+    mac = FakeMac(delay=args.say_delay, per_char_delay=args.say_per_char, bytes_per_char=args.audio_bytes_per_char)
+    mac_port = mac.start()
+    s3_server = None
+    s3_endpoint = args.s3_endpoint
+    if not s3_endpoint:
+        s3_endpoint, s3_server = _start_s3()
+    agent_port, agent_server = _start_agent(mac) if args.agent else (0, None)
+    _configure(args, mac_port, s3_endpoint, agent_port)
+
+    import tts_mcp.tools as tools
+
+    scenarios = []
+    try:
+        for scenario in args.scenario:
+            for text_chars in args.text_chars:
+                for hit_ratio in args.hit_ratio:
+                    for concurrency in args.concurrency:
+                        result = asyncio.run(_run_scenario(tools, scenario, concurrency, text_chars, hit_ratio, args.requests))
+                        scenarios.append(result)
+                        print(f"{scenario:<4} chars={text_chars:<6} hit={hit_ratio:<4} conc={concurrency:<3} rps={result['rps']:<8} p50={result['p50_s']}s p99={result['p99_s']}s errors={result['errors']}")
+    finally:
+        mac.stop()
+        if agent_server is not None:
+            agent_server.shutdown()
+        if s3_server is not None:
+            s3_server.stop()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("s3_access_key", "s3_secret_key", "output")},
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# benchmarks/fake_mac.py
+
+"""A local paramiko SSH/SFTP server that stands in for a Mac running `say`.
+
+`say -f - -o <path>` reads the text from stdin, sleeps for
+`delay + per_char_delay * len(text)` seconds and writes a silent PCM AIFF of
+`bytes_per_char * len(text)` bytes (at least `min_bytes`) to <path>. A leading
+`rm -f <paths>;` is honoured; other commands succeed without doing anything.
+Remote paths map into a temporary directory. Port forwards (direct-tcpip)
+connect to the local port, so agent/say_agent.py can serve FakeSayEngine here
+as well.
+"""
+
+import os
+import re
+import shlex
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+import paramiko
+
+def make_aiff(data_bytes: int) -> bytes:
+    frames = max(1, data_bytes // 2)
+    # 22.05 kHz as an 80-bit IEEE extended float.
+    rate = b"\x40\x0d\xac\x44\x00\x00\x00\x00\x00\x00"
+    comm = struct.pack(">hIh", 1, frames, 16) + rate
+    sound = struct.pack(">II", 0, 0) + b"\x00" * (frames * 2)
+    body = b"AIFF" + b"COMM" + struct.pack(">I", len(comm)) + comm + b"SSND" + struct.pack(">I", len(sound)) + sound
+    return b"FORM" + struct.pack(">I", len(body)) + body
+
+class FakeSayEngine:
+    """say_agent engine with the same timing and output as the fake `say`."""
+
+    name = "fake"
+
+    def __init__(self, mac: "FakeMac") -> None:
+        self.mac = mac
+
+    def warm(self, voices: list[str]) -> None:
+        pass
+
+    def render(self, text: str, voice: str, rate: int, path: str) -> None:
+        size = len(text.encode("utf-8"))
+        time.sleep(self.mac.delay + self.mac.per_char_delay * size)
+        with open(path, "wb") as f:
+            f.write(make_aiff(max(self.mac.min_bytes, self.mac.bytes_per_char * size)))
+
+class _Server(paramiko.ServerInterface):
+    def __init__(self, mac: "FakeMac") -> None:
+        self.mac = mac
+        self.forwards: dict[int, tuple[str, int]] = {}
+
+    def check_auth_password(self, username: str, password: str) -> int:
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_auth_publickey(self, username: str, key: paramiko.PKey) -> int:
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "password,publickey"
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        return paramiko.OPEN_SUCCEEDED if kind == "session" else paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_direct_tcpip_request(self, chanid: int, origin: tuple, destination: tuple) -> int:
+        self.forwards[chanid] = destination
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel: paramiko.Channel, command: bytes) -> bool:
+        threading.Thread(target=self.mac.exec_command, args=(channel, command.decode("utf-8")), daemon=True).start()
+        return True
+
+class _SFTPHandle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno() if self.readfile else self.writefile.fileno()))
+
+class _SFTPServer(paramiko.SFTPServerInterface):
+    def __init__(self, server: _Server, *args, **kwargs) -> None:
+        super().__init__(server, *args, **kwargs)
+        self.mac = server.mac
+
+    def _stat(self, path: str):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self.mac.local_path(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    stat = _stat
+    lstat = _stat
+
+    def open(self, path: str, flags: int, attr):
+        local = self.mac.local_path(path)
+        try:
+            if not flags & (os.O_WRONLY | os.O_RDWR):
+                mode = "rb"
+            elif os.path.exists(local) and not flags & os.O_TRUNC:
+                mode = "r+b"
+            else:
+                mode = "w+b"
+            f = open(local, mode)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        handle = _SFTPHandle(flags)
+        handle.filename = local
+        handle.readfile = f
+        handle.writefile = f
+        return handle
+
+    def remove(self, path: str) -> int:
+        try:
+            os.remove(self.mac.local_path(path))
+            return paramiko.SFTP_OK
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def list_folder(self, path: str):
+        local = self.mac.local_path(path)
+        try:
+            entries = []
+            for name in os.listdir(local):
+                attr = paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(local, name)))
+                attr.filename = name
+                entries.append(attr)
+            return entries
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+class FakeMac:
+    def __init__(self, delay: float = 0.2, per_char_delay: float = 0.0005, bytes_per_char: int = 2000, min_bytes: int = 4096, working_path: str = "/tmp") -> None:
+        self.delay = delay
+        self.per_char_delay = per_char_delay
+        self.bytes_per_char = bytes_per_char
+        self.min_bytes = min_bytes
+        self.root = tempfile.mkdtemp(prefix="fake-mac-")
+        # The server lists and sweeps its working directory, so it has to exist like /tmp does on a Mac.
+        os.makedirs(self.local_path(working_path), exist_ok=True)
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.commands = 0
+        self._socket = None
+        self.port = None
+
+    def local_path(self, remote_path: str) -> str:
+        """Map a remote path onto the same tree under root; ".." cannot climb out of it."""
+        return os.path.join(self.root, os.path.normpath("/" + remote_path).lstrip("/"))
+
+    def exec_command(self, channel: paramiko.Channel, command: str) -> None:
+        self.commands += 1
+        status = 0
+        try:
+            removals = re.match(r"rm -f ([^;]+)(?:;|$)", command)
+            if removals:
+                for path in shlex.split(removals.group(1)):
+                    if os.path.exists(self.local_path(path)):
+                        os.remove(self.local_path(path))
+            match = re.search(r"\bsay\b.*?-o\s+(\S+)", command)
+            if match:
+                text = b""
+                while True:
+                    data = channel.recv(65536)
+                    if not data:
+                        break
+                    text += data
+                time.sleep(self.delay + self.per_char_delay * len(text))
+                with open(self.local_path(shlex.split(match.group(1))[0]), "wb") as f:
+                    f.write(make_aiff(max(self.min_bytes, self.bytes_per_char * len(text))))
+        except Exception as e:
+            channel.sendall_stderr(str(e).encode())
+            status = 1
+        finally:
+            channel.send_exit_status(status)
+            channel.close()
+
+    def _serve(self, client: socket.socket) -> None:
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self.host_key)
+        transport.set_subsystem_handler("sftp", paramiko.SFTPServer, _SFTPServer)
+        server = _Server(self)
+        transport.start_server(server=server)
+        # Bridge direct-tcpip channels (port forwards, e.g. to say_agent) to local sockets.
+        while transport.is_active():
+            channel = transport.accept(1)
+            if channel is not None and channel.get_id() in server.forwards:
+                threading.Thread(target=self._forward, args=(channel, server.forwards.pop(channel.get_id())), daemon=True).start()
+
+    @staticmethod
+    def _forward(channel: paramiko.Channel, destination: tuple) -> None:
+        try:
+            target = socket.create_connection(destination)
+        except OSError:
+            channel.close()
+            return
+
+        def pump(read, write) -> None:
+            try:
+                while True:
+                    data = read(65536)
+                    if not data:
+                        break
+                    write(data)
+            except OSError:
+                pass
+            finally:
+                channel.close()
+                target.close()
+
+        threading.Thread(target=pump, args=(target.recv, channel.sendall), daemon=True).start()
+        pump(channel.recv, target.sendall)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self._socket.listen(64)
+        self.port = self._socket.getsockname()[1]
+
+        def accept() -> None:
+            while True:
+                try:
+                    client, _ = self._socket.accept()
+                except OSError:
+                    return
+                threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+        threading.Thread(target=accept, daemon=True).start()
+        return self.port
+
+    def stop(self) -> None:
+        if self._socket:
+            self._socket.close()
@@ -1 +1,8 @@
-from tts_mcp.main import *
\ No newline at end of file
+def __getattr__(name: str):
+    # Importing tts_mcp.main builds the server; defer it until something from
+    # it is used, so `python -m tts_mcp.main` and submodule imports stay cheap.
+    import tts_mcp.main as main
+    try:
+        return getattr(main, name)
+    except AttributeError:
+        raise AttributeError(f"module 'tts_mcp' has no attribute '{name}'") from None
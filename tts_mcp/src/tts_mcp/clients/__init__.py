@@ -1,4 +1,8 @@
 from .minio import MinioClient
-from .mac_ssh import MacSSHClient
+from .mac_ssh import MacCommandError, MacSSHClient, MacStream, MacTransportError
+from .mac_ssh_pool import MacPoolTimeout, MacSSHPool
+from .mac_fleet import MacFleet
+from .mac_reaper import MacReaper
+from .mac_agent import MacAgentError, agent_audio
 
-__all__ = ["MinioClient", "MacSSHClient"]
\ No newline at end of file
+__all__ = ["MinioClient", "MacCommandError", "MacSSHClient", "MacStream", "MacTransportError", "MacPoolTimeout", "MacSSHPool", "MacFleet", "MacReaper", "MacAgentError", "agent_audio"]
@@ -0,0 +1,70 @@
+# clients/mac_agent.py
+
+from contextlib import contextmanager
+from typing import Iterator
+import json
+import struct
+
+from .mac_ssh import MacSSHClient, MacTransportError
+from tts_mcp.utils.metrics import BYTES_TOTAL
+
+# Must match agent/say_agent.py.
+FRAME_HEADER = struct.Struct(">I")
+
+class MacAgentError(RuntimeError):
+    """The agent answered but could not synthesize the text."""
+
+class _AgentAudio:
+    """File-like view of exactly `length` bytes of audio on the tunnel."""
+
+    def __init__(self, stream, length: int) -> None:
+        self._stream = stream
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        # Raised as transport errors, so an upload reading this stream does not take them for its own.
+        try:
+            data = self._stream.read(size)
+        except Exception as e:
+            raise MacTransportError(f"Failed to read audio from the agent: {str(e)}") from e
+        if not data:
+            raise MacTransportError("Agent closed the connection before sending all audio")
+        self.remaining -= len(data)
+        BYTES_TOTAL.inc(len(data), direction="mac_to_server")
+        return data
+
+def _read_exact(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) < size:
+        raise ConnectionError("Agent closed the connection")
+    return data
+
+@contextmanager
+def agent_audio(client: MacSSHClient, port: int, text: str, voice: str = "", rate: int = 0, timeout: float = None) -> Iterator[tuple[int, _AgentAudio]]:
+    """Ask the say agent on the Mac for AIFF audio of text; yields (length, stream).
+
+    The tunnel stays open on the client for the next request unless the
+    exchange fails or the audio is not read to the end.
+    """
+    channel = client.tunnel(port, timeout)
+    clean = False
+    try:
+        stream = channel.makefile("rb")
+        request = json.dumps({"text": text, "voice": voice or "", "rate": int(rate or 0)}).encode("utf-8")
+        channel.sendall(FRAME_HEADER.pack(len(request)) + request)
+        BYTES_TOTAL.inc(len(request), direction="server_to_mac")
+        (size,) = FRAME_HEADER.unpack(_read_exact(stream, FRAME_HEADER.size))
+        header = json.loads(_read_exact(stream, size))
+        if not header.get("ok"):
+            clean = True
+            raise MacAgentError(header.get("error") or "Agent failed to synthesize")
+        audio = _AgentAudio(stream, int(header["length"]))
+        yield audio.remaining, audio
+        clean = audio.remaining == 0
+    finally:
+        if not clean:
+            client.close_tunnel(port)
@@ -0,0 +1,194 @@
+# clients/mac_fleet.py
+
+from typing import Any, Callable
+import logging
+import threading
+import time
+
+from .mac_ssh import MacSSHClient, MacTransportError
+from .mac_ssh_pool import MacPoolTimeout, MacSSHPool
+from tts_mcp.utils import CircuitBreaker, Overloaded
+
+class MacWorker:
+    """One Mac in the fleet: its connection pool, circuit breaker and load figures."""
+
+    # Weight of the newest sample in the latency moving average.
+    _LATENCY_ALPHA = 0.3
+
+    def __init__(self, pool: MacSSHPool, breaker: CircuitBreaker) -> None:
+        self.pool = pool
+        self.breaker = breaker
+        self.host = pool.host
+        self.id = pool.id
+        self.outstanding = 0
+        self.latency = 0.0
+        self.completed = 0
+        self.failed = 0
+
+    def record_latency(self, seconds: float) -> None:
+        if self.completed == 0:
+            self.latency = seconds
+        else:
+            self.latency = self._LATENCY_ALPHA * seconds + (1 - self._LATENCY_ALPHA) * self.latency
+
+    def stats(self) -> dict:
+        return {
+            "host": self.id,
+            "state": self.breaker.state,
+            "outstanding": self.outstanding,
+            "latency": round(self.latency, 3),
+            "completed": self.completed,
+            "failed": self.failed,
+            "pool": self.pool.stats(),
+        }
+
+class MacFleet:
+    """Schedule jobs across several Macs, skipping hosts whose circuit breaker is open and retrying elsewhere on failure."""
+
+    LEAST_OUTSTANDING = "least_outstanding"
+    LATENCY = "latency"
+
+    def __init__(self, hosts: list[str], user: str, password: str = None, key_filename: str = None, port: int = 22, working_path: str = "/tmp", connect_timeout: float = 10, pool_size: int = 4, idle_timeout: float = 300, checkout_timeout: float = 30, strategy: str = LEAST_OUTSTANDING, max_attempts: int = 2, max_inflight: int = 0, failure_threshold: int = 3, reset_timeout: float = 30, logger: logging.Logger = logging.getLogger(__name__)) -> None:
+        if not hosts:
+            raise ValueError("At least one Mac host is required")
+        self.logger = logger
+        self.strategy = strategy
+        self.max_attempts = max(1, int(max_attempts))
+        # Jobs running at once on one Mac; 0 means no limit beyond the pool.
+        self.max_inflight = max(0, int(max_inflight))
+        self.checkout_timeout = checkout_timeout
+        self._lock = threading.Condition()
+        self.workers: list[MacWorker] = []
+        for spec in hosts:
+            host, host_port = self._parse_host(spec, port)
+            breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+            pool_kwargs = dict(host=host, user=user, password=password, key_filename=key_filename, port=host_port, working_path=working_path, connect_timeout=connect_timeout, size=pool_size, idle_timeout=idle_timeout, checkout_timeout=checkout_timeout, logger=logger)
+            try:
+                pool = MacSSHPool(**pool_kwargs)
+            except Exception as e:
+                # Keep the host in the fleet but out of rotation until the breaker lets a probe through.
+                self.logger.error(f"Mac '{host}' is unavailable, taking it out of rotation: {str(e)}")
+                pool = MacSSHPool(connect=False, **pool_kwargs)
+                breaker.trip()
+            self.workers.append(MacWorker(pool, breaker))
+        if all(worker.breaker.state == CircuitBreaker.OPEN for worker in self.workers):
+            raise ConnectionError(f"None of the Mac hosts are reachable: {', '.join(hosts)}")
+
+    @staticmethod
+    def _parse_host(spec: str, default_port: int) -> tuple[str, int]:
+        host, sep, port = spec.strip().rpartition(":")
+        if sep and port.isdigit():
+            return host, int(port)
+        return spec.strip(), int(default_port)
+
+    def _score(self, worker: MacWorker) -> float:
+        if self.strategy == self.LATENCY:
+            # Expected wait: queued jobs times the typical job time on that host.
+            return (worker.outstanding + 1) * (worker.latency or 1.0)
+        return worker.outstanding
+
+    def _pick(self, exclude: set[str]) -> MacWorker:
+        """Reserve the best Mac; None if every one is down, Overloaded if they stay at their job limit for checkout_timeout."""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._lock:
+            while True:
+                candidates = [w for w in self.workers if w.id not in exclude]
+                # Break ties by total jobs handled so idle hosts share the load evenly.
+                candidates.sort(key=lambda w: (self._score(w), w.completed + w.failed))
+                full = False
+                for worker in candidates:
+                    if self.max_inflight and worker.outstanding >= self.max_inflight:
+                        full = full or worker.breaker.state != CircuitBreaker.OPEN
+                        continue
+                    if worker.breaker.allow():
+                        worker.outstanding += 1
+                        return worker
+                remaining = deadline - time.monotonic()
+                if not full:
+                    return None
+                if remaining <= 0:
+                    raise self._overloaded()
+                # Wait for a job to finish on a Mac that is at its limit.
+                self._lock.wait(remaining)
+
+    def _overloaded(self) -> Overloaded:
+        # Every reachable Mac is busy: hint at one typical job time.
+        busy = [worker for worker in self.workers if worker.breaker.state != CircuitBreaker.OPEN]
+        retry_after = max(1.0, min((worker.latency for worker in busy if worker.latency), default=1.0))
+        return Overloaded(retry_after, sum(worker.outstanding for worker in busy))
+
+    def _finish(self, worker: MacWorker) -> None:
+        worker.outstanding -= 1
+        self._lock.notify_all()
+
+    def capacity(self) -> int:
+        """Jobs the Macs that are not known to be down can run at once."""
+        per_mac = self.max_inflight or self.workers[0].pool.size
+        return per_mac * sum(1 for worker in self.workers if worker.breaker.state != CircuitBreaker.OPEN)
+
+    def run(self, fn: Callable[[MacSSHClient], Any]) -> Any:
+        """Run fn with a pooled connection on the best available Mac, retrying on another host if it fails."""
+        tried: set[str] = set()
+        last_error = None
+        for _ in range(self.max_attempts):
+            try:
+                worker = self._pick(tried)
+            except Overloaded:
+                if last_error is not None and not isinstance(last_error, MacPoolTimeout):
+                    raise last_error
+                raise
+            if worker is None:
+                break
+            tried.add(worker.id)
+            started = time.monotonic()
+            try:
+                with worker.pool.connection() as client:
+                    result = fn(client)
+            except MacTransportError as e:
+                # Only failures of the Mac or the link to it, as raised by the
+                # SSH client and streams read from the Mac, count against it.
+                # Anything else (a say error, a failed upload, a local disk
+                # error) would fail the same way on every host.
+                last_error = e
+                worker.breaker.record_failure()
+                with self._lock:
+                    self._finish(worker)
+                    worker.failed += 1
+                self.logger.warning(f"Job failed on Mac '{worker.id}': {str(e)}")
+                continue
+            except MacPoolTimeout as e:
+                # Busy, not broken: try another Mac without tripping this one's breaker.
+                last_error = e
+                if worker.breaker.state == CircuitBreaker.HALF_OPEN:
+                    worker.breaker.record_success()
+                with self._lock:
+                    self._finish(worker)
+                self.logger.info(f"Mac '{worker.id}' is busy: {str(e)}")
+                continue
+            except Exception:
+                # A half-open probe that reached the Mac still shows it is back.
+                if worker.breaker.state == CircuitBreaker.HALF_OPEN:
+                    worker.breaker.record_success()
+                with self._lock:
+                    self._finish(worker)
+                    worker.failed += 1
+                raise
+            worker.breaker.record_success()
+            with self._lock:
+                self._finish(worker)
+                worker.record_latency(time.monotonic() - started)
+                worker.completed += 1
+            return result
+        if isinstance(last_error, MacPoolTimeout):
+            raise self._overloaded() from last_error
+        if last_error is not None:
+            raise last_error
+        raise ConnectionError("No Mac host is available: all are down or at their job limit")
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [worker.stats() for worker in self.workers]
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.pool.close()
@@ -0,0 +1,98 @@
+# clients/mac_reaper.py
+
+import logging
+import re
+import shlex
+import threading
+
+from .mac_fleet import MacFleet
+from tts_mcp.utils import CircuitBreaker
+from tts_mcp.utils.metrics import REMOTE_FILES_REMOVED_TOTAL
+
+class MacReaper:
+    """Remove temporary files from the Macs off the request path.
+
+    Finished jobs hand their remote files to `defer`. The next job on the same
+    Mac prepends them to its own command via `take`, and a background thread
+    flushes whatever is left and sweeps files older than max_age that failed
+    or interrupted jobs left behind.
+    """
+
+    # Keep each rm well below the remote ARG_MAX.
+    _BATCH = 200
+
+    def __init__(self, fleet: MacFleet, working_path: str, pattern: str, interval: float = 60, max_age: float = 900, logger: logging.Logger = logging.getLogger(__name__)) -> None:
+        self.fleet = fleet
+        self.working_path = working_path.rstrip("/") or "/"
+        # Only names matching this are ever swept; the working path may be shared, e.g. /tmp.
+        self.pattern = re.compile(pattern)
+        self.interval = interval
+        self.max_age = max_age
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[str]] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def defer(self, mac_id: str, remote_path: str) -> None:
+        with self._lock:
+            self._pending.setdefault(mac_id, []).append(remote_path)
+
+    def take(self, mac_id: str) -> list[str]:
+        """Hand over the files waiting for removal on the Mac with this host:port id; the caller must remove them."""
+        with self._lock:
+            paths = self._pending.pop(mac_id, [])
+        if paths:
+            REMOTE_FILES_REMOVED_TOTAL.inc(len(paths), mode="piggyback")
+        return paths
+
+    @staticmethod
+    def rm_command(paths: list[str]) -> str:
+        return "rm -f " + " ".join(shlex.quote(path) for path in paths)
+
+    def _remove(self, client, paths: list[str]) -> None:
+        for start in range(0, len(paths), self._BATCH):
+            client.run_command(self.rm_command(paths[start:start + self._BATCH]))
+
+    def sweep(self) -> int:
+        """Flush deferred files and remove stale ones on every reachable Mac; returns the number of files removed."""
+        removed = 0
+        for worker in self.fleet.workers:
+            # Read the state rather than calling allow(), which would use up a half-open probe.
+            if worker.breaker.state == CircuitBreaker.OPEN:
+                continue
+            with self._lock:
+                pending = self._pending.pop(worker.id, [])
+            try:
+                with worker.pool.connection() as client:
+                    stale = [f"{self.working_path}/{name}" for name in client.list_files(self.working_path, older_than=self.max_age) if self.pattern.match(name)]
+                    paths = list(dict.fromkeys(pending + stale))
+                    if paths:
+                        self._remove(client, paths)
+            except Exception as e:
+                self.logger.warning(f"Cleanup on Mac '{worker.id}' failed: {str(e)}")
+                with self._lock:
+                    self._pending.setdefault(worker.id, []).extend(pending)
+                continue
+            if pending:
+                REMOTE_FILES_REMOVED_TOTAL.inc(len(pending), mode="deferred")
+            if len(paths) > len(pending):
+                REMOTE_FILES_REMOVED_TOTAL.inc(len(paths) - len(pending), mode="stale")
+                self.logger.info(f"Removed {len(paths) - len(pending)} stale file(s) from '{worker.id}'.")
+            removed += len(paths)
+        return removed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Cleanup sweep failed: {str(e)}")
+
+    def start(self) -> None:
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="mac-reaper", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -1,92 +1,244 @@
 # clients/mac_ssh.py
 
+import functools
 import paramiko
 import logging
+import time
+from tts_mcp.utils.metrics import SSH_OPERATION_SECONDS, BYTES_TOTAL
+
+def _timed(operation: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with SSH_OPERATION_SECONDS.time(host=self.id, operation=operation):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+class MacCommandError(RuntimeError):
+    """A command ran on the Mac but exited with a non-zero status."""
+
+    def __init__(self, status: int, stderr: str) -> None:
+        self.status = status
+        self.stderr = stderr
+        super().__init__(f"Command exited with status {status}: {stderr}")
+
+class MacTransportError(ConnectionError):
+    """The Mac or the link to it failed; the same job may succeed on another Mac."""
+
+class MacStream:
+    """A file-like stream read from a Mac whose read errors surface as MacTransportError.
+
+    Whoever consumes it, such as a MinIO upload, can then tell a Mac that
+    went away mid-transfer from a failure of its own.
+    """
+
+    def __init__(self, stream, mac_id: str) -> None:
+        self._stream = stream
+        self.mac_id = mac_id
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._stream.read(size)
+        except MacTransportError:
+            raise
+        except Exception as e:
+            raise MacTransportError(f"Reading from Mac '{self.mac_id}' failed: {str(e)}") from e
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __enter__(self) -> "MacStream":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
 
 class MacSSHClient:
     _working_path: str
 
-    def __init__(self, host: str, user: str, password: str = None, key_filename: str = None, port: int = 22, working_path: str = "/tmp", logger: logging.Logger = logging.getLogger(__name__)) -> None:
+    def __init__(self, host: str, user: str, password: str = None, key_filename: str = None, port: int = 22, working_path: str = "/tmp", connect_timeout: float = 10, logger: logging.Logger = logging.getLogger(__name__)) -> None:
         self.logger = logger
         self.host = host
         self.user = user
         self.password = password
         self.key_filename = key_filename
         self.port = port
+        self.connect_timeout = connect_timeout
+        # host:port, so Macs sharing a hostname on different ports stay apart.
+        self.id = f"{host}:{port}"
         self._working_path = working_path
-        self.client = paramiko.SSHClient()
-        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.client = None
+        self._sftp = None
+        self._tunnels: dict[int, paramiko.Channel] = {}
+        self.last_used = time.monotonic()
         self._connect()
 
     def _connect(self):
+        self.client = paramiko.SSHClient()
+        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._sftp = None
+        self._tunnels = {}
+        # Bound every phase of the handshake so an unresponsive Mac fails fast instead of holding a caller.
+        timeouts = dict(timeout=self.connect_timeout, banner_timeout=self.connect_timeout, auth_timeout=self.connect_timeout)
         try:
             if self.key_filename:
-                self.client.connect(self.host, username=self.user, key_filename=self.key_filename, port=self.port)
+                self.client.connect(self.host, username=self.user, key_filename=self.key_filename, port=self.port, **timeouts)
             else:
-                self.client.connect(self.host, username=self.user, password=self.password, port=self.port)
+                self.client.connect(self.host, username=self.user, password=self.password, port=self.port, **timeouts)
         except Exception as e:
             self.logger.error(f"Failed to connect to SSH: {str(e)}")
-            raise
+            raise MacTransportError(f"Failed to connect to Mac '{self.id}': {str(e)}") from e
 
-    def _ensure_connection(self):
-        if self.client.get_transport() is None or not self.client.get_transport().is_active():
-            self.logger.info("SSH connection lost. Reconnecting...")
+    def is_healthy(self) -> bool:
+        transport = self.client.get_transport() if self.client else None
+        if transport is None or not transport.is_active():
+            return False
+        if self._sftp is not None and self._sftp.get_channel().closed:
+            return False
+        try:
+            # Writing a no-op packet surfaces broken sockets here rather than
+            # in the middle of a request.
+            transport.send_ignore()
+            return True
+        except Exception:
+            return False
+
+    def ensure_healthy(self) -> None:
+        if not self.is_healthy():
+            self.logger.info(f"SSH connection to '{self.id}' is unhealthy. Reconnecting...")
+            self.close()
             self._connect()
 
-    def __del__(self) -> None:
+    def _get_sftp(self) -> paramiko.SFTPClient:
+        if self._sftp is None or self._sftp.get_channel().closed:
+            self._sftp = self.client.open_sftp()
+        self.last_used = time.monotonic()
+        return self._sftp
+
+    @_timed("tunnel")
+    def tunnel(self, port: int, timeout: float = None) -> paramiko.Channel:
+        """Return a direct-tcpip channel to localhost:port on the Mac, reusing the open one if it is still alive."""
+        channel = self._tunnels.get(port)
+        if channel is None or channel.closed:
+            channel = self.client.get_transport().open_channel("direct-tcpip", ("127.0.0.1", port), ("127.0.0.1", 0), timeout=timeout)
+            self._tunnels[port] = channel
+        channel.settimeout(timeout)
+        self.last_used = time.monotonic()
+        return channel
+
+    def close_tunnel(self, port: int) -> None:
+        channel = self._tunnels.pop(port, None)
+        if channel is not None:
+            channel.close()
+
+    def close(self) -> None:
         try:
-            self.client.close()
+            for port in list(self._tunnels):
+                self.close_tunnel(port)
+            if self._sftp is not None:
+                self._sftp.close()
+            if self.client is not None:
+                self.client.close()
         except Exception as e:
             self.logger.warning(f"Failed to close SSH connection: {str(e)}")
+        finally:
+            self._sftp = None
 
+    def __del__(self) -> None:
+        self.close()
+
+    @_timed("exec")
     def run_command(self, command: str) -> str:
         try:
-            self._ensure_connection()
+            self.last_used = time.monotonic()
             stdin, stdout, stderr = self.client.exec_command(command)
             return stdout.read().decode("utf-8")
         except Exception as e:
             self.logger.error(f"Failed to run command '{command}': {str(e)}")
             return ""
 
+    @_timed("exec")
+    def run_command_with_input(self, command: str, data: bytes, check: bool = False) -> bool:
+        """Run command with data on stdin; with check, raise MacCommandError on a non-zero exit and MacTransportError if the Mac could not be reached, instead of returning False."""
+        try:
+            self.last_used = time.monotonic()
+            stdin, stdout, stderr = self.client.exec_command(command)
+            stdin.write(data)
+            stdin.flush()
+            BYTES_TOTAL.inc(len(data), direction="server_to_mac")
+            stdin.channel.shutdown_write()
+            exit_status = stdout.channel.recv_exit_status()
+            if exit_status != 0:
+                error = stderr.read().decode("utf-8", "replace").strip()
+                if check:
+                    raise MacCommandError(exit_status, error)
+                self.logger.error(f"Command '{command}' exited with status {exit_status}: {error}")
+                return False
+            return True
+        except MacCommandError:
+            raise
+        except Exception as e:
+            if check:
+                raise MacTransportError(f"Failed to run command on Mac '{self.id}': {str(e)}") from e
+            self.logger.error(f"Failed to run command '{command}': {str(e)}")
+            return False
+
+    def open_file(self, remote_path: str) -> MacStream:
+        """Open a file on the Mac for reading; failures to open or read it raise MacTransportError."""
+        try:
+            sftp = self._get_sftp()
+            remote_file = sftp.open(remote_path, "rb")
+            remote_file.prefetch()
+        except Exception as e:
+            raise MacTransportError(f"Failed to open '{remote_path}' on Mac '{self.id}': {str(e)}") from e
+        return MacStream(remote_file, self.id)
+
+    @_timed("stat")
+    def file_size(self, remote_path: str) -> int:
+        try:
+            sftp = self._get_sftp()
+            return sftp.stat(remote_path).st_size
+        except Exception as e:
+            self.logger.error(f"Failed to stat file '{remote_path}': {str(e)}")
+            return -1
+
+    @_timed("upload")
     def upload_file(self, file_path: str, remote_path: str) -> bool:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             sftp.put(file_path, remote_path)
-            sftp.close()
             return True
         except Exception as e:
             self.logger.error(f"Failed to upload file '{file_path}' to '{remote_path}': {str(e)}")
             return False
 
+    @_timed("download")
     def download_file(self, remote_path: str, file_path: str = None) -> bool:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             sftp.get(remote_path, file_path)
-            sftp.close()
             return True
         except Exception as e:
             self.logger.error(f"Failed to download file '{remote_path}' to '{file_path}': {str(e)}")
             return False
 
+    @_timed("stat")
     def exists_file(self, remote_path: str) -> bool:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             sftp.stat(remote_path)
-            sftp.close()
             return True
         except Exception as e:
             self.logger.error(f"Failed to check if file '{remote_path}' exists: {str(e)}")
             return False
 
+    @_timed("delete")
     def delete_file(self, remote_path: str) -> bool:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             sftp.remove(remote_path)
-            sftp.close()
             return True
         except Exception as e:
             self.logger.error(f"Failed to delete file '{remote_path}': {str(e)}")
@@ -94,10 +246,8 @@ class MacSSHClient:
 
     def exists_directory(self, remote_path: str) -> bool:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             sftp.stat(remote_path)
-            sftp.close()
             return True
         except Exception as e:
             self.logger.error(f"Failed to check if directory '{remote_path}' exists: {str(e)}")
@@ -105,32 +255,30 @@ class MacSSHClient:
 
     def delete_directory(self, remote_path: str) -> bool:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             sftp.remove(remote_path)
-            sftp.close()
             return True
         except Exception as e:
             self.logger.error(f"Failed to delete directory '{remote_path}': {str(e)}")
             return False
 
-    def list_files(self, remote_path: str) -> list[str]:
+    @_timed("list")
+    def list_files(self, remote_path: str, older_than: float = None) -> list[str]:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
-            files = sftp.listdir(remote_path)
-            sftp.close()
-            return files
+            sftp = self._get_sftp()
+            if older_than is None:
+                return sftp.listdir(remote_path)
+            # Modification times come from the Mac's clock.
+            cutoff = time.time() - older_than
+            return [entry.filename for entry in sftp.listdir_attr(remote_path) if entry.st_mtime is not None and entry.st_mtime < cutoff]
         except Exception as e:
             self.logger.error(f"Failed to list files in directory '{remote_path}': {str(e)}")
             return []
 
     def list_directories(self, remote_path: str) -> list[str]:
         try:
-            self._ensure_connection()
-            sftp = self.client.open_sftp()
+            sftp = self._get_sftp()
             directories = sftp.listdir(remote_path)
-            sftp.close()
             return directories
         except Exception as e:
             self.logger.error(f"Failed to list directories in directory '{remote_path}': {str(e)}")
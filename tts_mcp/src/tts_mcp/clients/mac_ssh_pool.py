@@ -0,0 +1,153 @@
+# clients/mac_ssh_pool.py
+
+from contextlib import contextmanager
+from typing import Iterator
+import logging
+import queue
+import threading
+import time
+
+from .mac_ssh import MacSSHClient
+
+class MacPoolTimeout(TimeoutError):
+    """Every connection to a Mac stayed in use for checkout_timeout; the Mac is busy, not broken."""
+
+class MacSSHPool:
+    """A bounded pool of MacSSHClient connections, each keeping its SFTP session open."""
+
+    def __init__(self, host: str, user: str, password: str = None, key_filename: str = None, port: int = 22, working_path: str = "/tmp", connect_timeout: float = 10, size: int = 4, idle_timeout: float = 300, checkout_timeout: float = 30, connect: bool = True, logger: logging.Logger = logging.getLogger(__name__)) -> None:
+        self.logger = logger
+        self.host = host
+        self.id = f"{host}:{port}"
+        self._client_kwargs = dict(host=host, user=user, password=password, key_filename=key_filename, port=port, working_path=working_path, connect_timeout=connect_timeout, logger=logger)
+        self.size = max(1, int(size))
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._idle: queue.LifoQueue[MacSSHClient] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        if connect:
+            # Connect once up front so a misconfigured host fails at startup.
+            self._release(self._create())
+
+    def _create(self) -> MacSSHClient:
+        with self._lock:
+            self._created += 1
+        try:
+            return MacSSHClient(**self._client_kwargs)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, client: MacSSHClient) -> None:
+        client.close()
+        with self._lock:
+            self._created -= 1
+
+    def _acquire(self) -> MacSSHClient:
+        self.prune_idle()
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            try:
+                client = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_create = self._created < self.size
+            if can_create:
+                client = self._create()
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise MacPoolTimeout(f"No SSH connection to '{self.id}' available after {self.checkout_timeout}s")
+            # Wake up periodically: a discarded connection frees capacity
+            # without anything being put back on the idle queue.
+            try:
+                client = self._idle.get(timeout=min(remaining, 0.5))
+                break
+            except queue.Empty:
+                continue
+        try:
+            client.ensure_healthy()
+        except Exception:
+            self._discard(client)
+            raise
+        with self._lock:
+            self._in_use += 1
+        return client
+
+    def _release(self, client: MacSSHClient) -> None:
+        self._idle.put(client)
+
+    @contextmanager
+    def connection(self) -> Iterator[MacSSHClient]:
+        client = self._acquire()
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._release(client)
+
+    def prune_idle(self) -> int:
+        """Close connections that have sat idle longer than idle_timeout."""
+        if not self.idle_timeout or self.idle_timeout <= 0:
+            return 0
+        now = time.monotonic()
+        keep, pruned = [], 0
+        while True:
+            try:
+                client = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if now - client.last_used > self.idle_timeout:
+                self._discard(client)
+                pruned += 1
+            else:
+                keep.append(client)
+        # LifoQueue: put oldest first so the most recently used comes out next.
+        for client in reversed(keep):
+            self._idle.put(client)
+        if pruned:
+            self.logger.info(f"Closed {pruned} idle SSH connection(s) to '{self.id}'.")
+        return pruned
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": self.size, "created": self._created, "in_use": self._in_use, "idle": self._idle.qsize()}
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    # Convenience wrappers that check out a connection for a single call.
+
+    def run_command(self, command: str) -> str:
+        with self.connection() as client:
+            return client.run_command(command)
+
+    def upload_file(self, file_path: str, remote_path: str) -> bool:
+        with self.connection() as client:
+            return client.upload_file(file_path, remote_path)
+
+    def download_file(self, remote_path: str, file_path: str = None) -> bool:
+        with self.connection() as client:
+            return client.download_file(remote_path, file_path)
+
+    def exists_file(self, remote_path: str) -> bool:
+        with self.connection() as client:
+            return client.exists_file(remote_path)
+
+    def delete_file(self, remote_path: str) -> bool:
+        with self.connection() as client:
+            return client.delete_file(remote_path)
+
+    def list_files(self, remote_path: str, older_than: float = None) -> list[str]:
+        with self.connection() as client:
+            return client.list_files(remote_path, older_than)
@@ -8,13 +8,35 @@ from minio.lifecycleconfig import (
     Expiration,
 )
 from minio.commonconfig import Filter
+from minio.deleteobjects import DeleteObject
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
 import json
 import logging
+import mimetypes
+import re
+from tts_mcp.utils.metrics import MINIO_OPERATION_SECONDS, BYTES_TOTAL
+
+class _SourceReader:
+    """Remember the error raised by the stream being uploaded, so it is not mistaken for a MinIO failure."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self.error: Exception = None
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._stream.read(size)
+        except Exception as e:
+            self.error = e
+            raise
 
 class MinioClient:
     _bucket: str
     
-    def __init__(self, endpoint: str, access_key: str, secret_key: str, secure: bool, bucket: str, logger: logging.Logger = logging.getLogger(__name__)) -> None:
+    def __init__(self, endpoint: str, access_key: str, secret_key: str, secure: bool, bucket: str, region: str = None, logger: logging.Logger = logging.getLogger(__name__)) -> None:
         self.logger = logger
         try:
             self.client = Minio(
@@ -22,6 +44,7 @@ class MinioClient:
                 access_key=access_key,
                 secret_key=secret_key,
                 secure=secure,
+                region=region or None,
             )
         except Exception as e:
             self.logger.error(f"Failed to initialize MinIO client: {str(e)}")
@@ -87,14 +110,13 @@ class MinioClient:
             self.logger.error(f"Failed to set public read access for bucket '{bucket}': {str(e)}")
             return False
 
-    def delete_bucket(self, bucket: str = None, force: bool = False) -> bool:
+    def delete_bucket(self, bucket: str = None, force: bool = False, workers: int = 8) -> bool:
         bucket = bucket if bucket else self._bucket
         try:
             if force:
-                objects = self.client.list_objects(bucket_name=bucket, recursive=True)
-                for obj in objects:
-                    self.client.remove_object(bucket_name=bucket, object_name=obj.object_name)
-                self.logger.info(f"Objects in bucket '{bucket}' deleted.")
+                names = (obj.object_name for obj in self.client.list_objects(bucket_name=bucket, recursive=True))
+                removed = self.remove_objects(names, bucket=bucket, workers=workers)
+                self.logger.info(f"{removed} objects in bucket '{bucket}' deleted.")
             self.client.remove_bucket(bucket_name=bucket)
             self.logger.info(f"Bucket '{bucket}' deleted.")
             return True
@@ -112,17 +134,61 @@ class MinioClient:
     
     # File functions
 
-    def upload_file(self, file_path: str, object_name: str = None, bucket: str = None) -> bool:
+    @staticmethod
+    def _content_type(object_name: str, content_type: str = None) -> str:
+        return content_type or mimetypes.guess_type(object_name)[0] or "application/octet-stream"
+
+    @MINIO_OPERATION_SECONDS.time(operation="put")
+    def upload_file(self, file_path: str, object_name: str = None, bucket: str = None, content_type: str = None) -> bool:
         bucket = bucket if bucket else self._bucket
         object_name = object_name[1:] if object_name.startswith("/") else object_name
         try:
-            self.client.fput_object(bucket_name=bucket, object_name=object_name, file_path=file_path)
+            self.client.fput_object(bucket_name=bucket, object_name=object_name, file_path=file_path, content_type=self._content_type(object_name, content_type))
             self.logger.info(f"File '{file_path}' uploaded to '{bucket}' as '{object_name}'.")
             return True
         except Exception as e:
             self.logger.error(f"Failed to upload file '{file_path}' to '{bucket}' as '{object_name}': {str(e)}")
             return False
 
+    @MINIO_OPERATION_SECONDS.time(operation="put")
+    def upload_stream(self, data: BinaryIO, length: int, object_name: str, bucket: str = None, content_type: str = None, part_size: int = 0) -> bool:
+        """Upload length bytes read from data; False if MinIO fails, while an error reading data is raised as is."""
+        bucket = bucket if bucket else self._bucket
+        object_name = object_name[1:] if object_name.startswith("/") else object_name
+        source = _SourceReader(data)
+        try:
+            # Objects larger than part_size go up as a multipart upload, read
+            # straight from the stream without buffering the whole object.
+            self.client.put_object(bucket_name=bucket, object_name=object_name, data=source, length=length, content_type=self._content_type(object_name, content_type), part_size=part_size)
+            BYTES_TOTAL.inc(length, direction="to_minio")
+            self.logger.info(f"Stream uploaded to '{bucket}' as '{object_name}' ({length} bytes).")
+            return True
+        except Exception as e:
+            if source.error is not None:
+                # The source failed, not MinIO; let the caller see why.
+                raise source.error
+            self.logger.error(f"Failed to upload stream to '{bucket}' as '{object_name}': {str(e)}")
+            return False
+
+    @MINIO_OPERATION_SECONDS.time(operation="get")
+    def read_file(self, object_name: str, bucket: str = None) -> bytes:
+        bucket = bucket if bucket else self._bucket
+        object_name = object_name[1:] if object_name.startswith("/") else object_name
+        response = None
+        try:
+            response = self.client.get_object(bucket_name=bucket, object_name=object_name)
+            data = response.read()
+            BYTES_TOTAL.inc(len(data), direction="from_minio")
+            return data
+        except Exception as e:
+            self.logger.error(f"Failed to read file '{object_name}' from '{bucket}': {str(e)}")
+            return None
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
+    @MINIO_OPERATION_SECONDS.time(operation="get")
     def download_file(self, object_name: str, file_path: str = None, bucket: str = None) -> bool:
         bucket = bucket if bucket else self._bucket
         object_name = object_name[1:] if object_name.startswith("/") else object_name
@@ -134,6 +200,7 @@ class MinioClient:
             self.logger.error(f"Failed to download file '{object_name}' from '{bucket}' to '{file_path}': {str(e)}")
             return False
 
+    @MINIO_OPERATION_SECONDS.time(operation="delete")
     def delete_file(self, object_name: str, bucket: str = None) -> bool:
         bucket = bucket if bucket else self._bucket
         object_name = object_name[1:] if object_name.startswith("/") else object_name
@@ -145,11 +212,152 @@ class MinioClient:
             self.logger.error(f"Failed to delete file '{object_name}' from '{bucket}': {str(e)}")
             return False
 
+    @MINIO_OPERATION_SECONDS.time(operation="stat")
     def exists_file(self, object_name: str, bucket: str = None) -> bool:
         bucket = bucket if bucket else self._bucket
         object_name = object_name[1:] if object_name.startswith("/") else object_name
         try:
-            return self.client.bucket_exists(bucket_name=bucket)
+            self.client.stat_object(bucket_name=bucket, object_name=object_name)
+            return True
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject", "NoSuchBucket"):
+                return False
+            self.logger.error(f"Failed to check if file '{object_name}' exists in '{bucket}': {str(e)}")
+            return False
         except Exception as e:
             self.logger.error(f"Failed to check if file '{object_name}' exists in '{bucket}': {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    @MINIO_OPERATION_SECONDS.time(operation="stat")
+    def stat_file(self, object_name: str, bucket: str = None) -> dict:
+        bucket = bucket if bucket else self._bucket
+        object_name = object_name[1:] if object_name.startswith("/") else object_name
+        try:
+            stat = self.client.stat_object(bucket_name=bucket, object_name=object_name)
+            return {"etag": stat.etag, "size": stat.size, "content_type": stat.content_type, "last_modified": stat.last_modified}
+        except Exception as e:
+            self.logger.error(f"Failed to stat file '{object_name}' in '{bucket}': {str(e)}")
+            return None
+
+    # Presigned URLs let another host (e.g. a Mac with curl) read or write one object directly.
+    # Signing is local when the client has a region; otherwise the first call looks it up.
+
+    def presigned_get_url(self, object_name: str, bucket: str = None, expires: int = 900) -> str:
+        bucket = bucket if bucket else self._bucket
+        object_name = object_name[1:] if object_name.startswith("/") else object_name
+        try:
+            return self.client.presigned_get_object(bucket_name=bucket, object_name=object_name, expires=timedelta(seconds=expires))
+        except Exception as e:
+            self.logger.error(f"Failed to presign GET for '{object_name}' in '{bucket}': {str(e)}")
+            return None
+
+    def presigned_put_url(self, object_name: str, bucket: str = None, expires: int = 900) -> str:
+        bucket = bucket if bucket else self._bucket
+        object_name = object_name[1:] if object_name.startswith("/") else object_name
+        try:
+            return self.client.presigned_put_object(bucket_name=bucket, object_name=object_name, expires=timedelta(seconds=expires))
+        except Exception as e:
+            self.logger.error(f"Failed to presign PUT for '{object_name}' in '{bucket}': {str(e)}")
+            return None
+
+    # Bulk functions
+
+    def iter_objects(self, prefix: str = "", bucket: str = None, start_after: str = None) -> Iterator[dict]:
+        """Yield every object under prefix; the listing is fetched page by page as it is consumed."""
+        bucket = bucket if bucket else self._bucket
+        prefix = prefix[1:] if prefix.startswith("/") else prefix
+        for obj in self.client.list_objects(bucket_name=bucket, prefix=prefix or None, recursive=True, start_after=start_after):
+            if obj.is_dir:
+                continue
+            yield {"name": obj.object_name, "size": obj.size, "etag": obj.etag, "last_modified": obj.last_modified}
+
+    @MINIO_OPERATION_SECONDS.time(operation="list")
+    def list_objects(self, prefix: str = "", bucket: str = None, start_after: str = None, limit: int = 1000) -> tuple[list[dict], str]:
+        """Return one page of objects under prefix and the start_after marker for the next page (None on the last page)."""
+        bucket = bucket if bucket else self._bucket
+        try:
+            page = list(islice(self.iter_objects(prefix, bucket=bucket, start_after=start_after), limit + 1))
+        except Exception as e:
+            self.logger.error(f"Failed to list objects under '{prefix}' in '{bucket}': {str(e)}")
+            return [], None
+        if len(page) > limit:
+            return page[:limit], page[limit - 1]["name"]
+        return page, None
+
+    def _remove_batch(self, bucket: str, names: list[str]) -> int:
+        errors = list(self.client.remove_objects(bucket_name=bucket, delete_object_list=[DeleteObject(name) for name in names]))
+        for error in errors:
+            self.logger.error(f"Failed to delete file '{error.name}' from '{bucket}': {error.message}")
+        return len(names) - len(errors)
+
+    @MINIO_OPERATION_SECONDS.time(operation="delete_many")
+    def remove_objects(self, object_names: Iterable[str], bucket: str = None, workers: int = 8, batch_size: int = 1000) -> int:
+        """Delete objects with multi-object DELETE requests of up to batch_size keys, several batches at a time; returns how many were deleted."""
+        bucket = bucket if bucket else self._bucket
+        names = iter(object_names)
+        removed = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                pending = set()
+                for batch in iter(lambda: list(islice(names, batch_size)), []):
+                    # Bound the backlog so a huge listing is never held in memory at once.
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        removed += sum(future.result() for future in done)
+                    pending.add(executor.submit(self._remove_batch, bucket, batch))
+                removed += sum(future.result() for future in pending)
+        except Exception as e:
+            self.logger.error(f"Failed to delete objects from '{bucket}': {str(e)}")
+        return removed
+
+    def delete_prefix(self, prefix: str, bucket: str = None, workers: int = 8) -> int:
+        return self.remove_objects((obj["name"] for obj in self.iter_objects(prefix, bucket=bucket)), bucket=bucket, workers=workers)
+
+    def upload_files(self, files: Iterable[tuple[str, str]], bucket: str = None, workers: int = 8) -> dict[str, bool]:
+        """Upload (file_path, object_name) pairs in parallel; returns {object_name: uploaded}."""
+        files = list(files)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = executor.map(lambda item: self.upload_file(item[0], item[1], bucket=bucket), files)
+            return {object_name: ok for (_, object_name), ok in zip(files, results)}
+
+    def download_files(self, files: Iterable[tuple[str, str]], bucket: str = None, workers: int = 8) -> dict[str, bool]:
+        """Download (object_name, file_path) pairs in parallel; returns {object_name: downloaded}."""
+        files = list(files)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = executor.map(lambda item: self.download_file(item[0], item[1], bucket=bucket), files)
+            return {object_name: ok for (object_name, _), ok in zip(files, results)}
+
+    def prune(self, prefix: str = "", bucket: str = None, max_age: float = None, max_bytes: int = None, workers: int = 8, pattern: str = None) -> dict:
+        """Evict objects under prefix older than max_age seconds, then the oldest ones until the rest fit in max_bytes.
+
+        prefix is a folder: "tmp" covers "tmp/..." but not "tmp2/...". With
+        pattern, only objects whose name relative to prefix matches it are
+        considered. S3 keeps no access times, so recency is the last write;
+        cached audio is written once, which makes this LRU by creation.
+        """
+        bucket = bucket if bucket else self._bucket
+        prefix = prefix.strip("/")
+        prefix = f"{prefix}/" if prefix else ""
+        matcher = re.compile(pattern) if pattern else None
+        try:
+            objects = [obj for obj in self.iter_objects(prefix, bucket=bucket) if matcher is None or matcher.match(obj["name"][len(prefix):])]
+        except Exception as e:
+            self.logger.error(f"Failed to list objects under '{prefix}' in '{bucket}': {str(e)}")
+            return {"scanned": 0, "removed": 0, "freed_bytes": 0}
+        objects.sort(key=lambda obj: obj["last_modified"])
+        # Objects are oldest first, so both rules evict a prefix of the list.
+        count = 0
+        if max_age is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+            while count < len(objects) and objects[count]["last_modified"] < cutoff:
+                count += 1
+        if max_bytes is not None:
+            total = sum(obj["size"] for obj in objects[count:])
+            while count < len(objects) and total > max_bytes:
+                total -= objects[count]["size"]
+                count += 1
+        evict = objects[:count]
+        removed = self.remove_objects((obj["name"] for obj in evict), bucket=bucket, workers=workers)
+        freed = sum(obj["size"] for obj in evict)
+        self.logger.info(f"Pruned {removed} of {len(evict)} objects ({freed} bytes) under '{prefix}' in '{bucket}'.")
+        return {"scanned": len(objects), "removed": removed, "freed_bytes": freed}
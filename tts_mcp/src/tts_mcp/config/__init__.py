@@ -1,5 +1,6 @@
 from .base import *
 from .mac_setting import *
 from .minio_setting import *
+from .tts_setting import *
 
-__all__ = ["base", "mac_setting", "minio_setting"]
\ No newline at end of file
+__all__ = ["base", "mac_setting", "minio_setting", "tts_setting"]
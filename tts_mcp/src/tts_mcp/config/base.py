@@ -16,3 +16,8 @@ PORT = os.getenv("PORT", 8000)
 TRANSPORT = os.getenv("TRANSPORT", "streamable-http")
 
 LOCAL_WORKING_PATH = os.getenv("LOCAL_WORKING_PATH", "/tmp")
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "t")
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+# Mirror metrics to OpenTelemetry (needs the "otel" extra and an SDK/exporter configured, e.g. via opentelemetry-instrument).
+METRICS_OTEL = os.getenv("METRICS_OTEL", "false").lower() in ("true", "1", "t")
@@ -8,3 +8,27 @@ MAC_PASSWORD = os.getenv("MAC_PASSWORD", "password")
 MAC_SSH_FILE = os.getenv("MAC_SSH_FILE", "/home/user/.ssh/id_rsa")
 MAC_WORKING_PATH = os.getenv("MAC_WORKING_PATH", "/tmp")
 MAC_PORT = os.getenv("MAC_PORT", 22)
+# Seconds allowed for each phase of an SSH connect (TCP, banner, auth).
+MAC_CONNECT_TIMEOUT = float(os.getenv("MAC_CONNECT_TIMEOUT", "10"))
+# ffmpeg on the Mac, used to encode mp3/opus; Homebrew installs it outside the non-login PATH.
+MAC_FFMPEG = os.getenv("MAC_FFMPEG", "/opt/homebrew/bin/ffmpeg")
+MAC_POOL_SIZE = int(os.getenv("MAC_POOL_SIZE", "4"))
+MAC_POOL_IDLE_TIMEOUT = float(os.getenv("MAC_POOL_IDLE_TIMEOUT", "300"))
+MAC_POOL_CHECKOUT_TIMEOUT = float(os.getenv("MAC_POOL_CHECKOUT_TIMEOUT", "30"))
+
+# Comma-separated "host[:port]" list; falls back to MAC_HOST for a single Mac.
+MAC_HOSTS = [host.strip() for host in os.getenv("MAC_HOSTS", "").split(",") if host.strip()] or [MAC_HOST]
+MAC_SCHEDULER = os.getenv("MAC_SCHEDULER", "least_outstanding")
+MAC_MAX_ATTEMPTS = int(os.getenv("MAC_MAX_ATTEMPTS", "2"))
+# Jobs running at once on each Mac; further jobs wait in the server's admission queue.
+MAC_MAX_INFLIGHT = int(os.getenv("MAC_MAX_INFLIGHT", str(MAC_POOL_SIZE)))
+MAC_FAILURE_THRESHOLD = int(os.getenv("MAC_FAILURE_THRESHOLD", "3"))
+MAC_RESET_TIMEOUT = float(os.getenv("MAC_RESET_TIMEOUT", "30"))
+# Leftover audio on the Macs is removed in the background: swept every MAC_CLEANUP_INTERVAL seconds once older than MAC_CLEANUP_MAX_AGE.
+MAC_CLEANUP_INTERVAL = float(os.getenv("MAC_CLEANUP_INTERVAL", "60"))
+MAC_CLEANUP_MAX_AGE = float(os.getenv("MAC_CLEANUP_MAX_AGE", "900"))
+# Port of agent/say_agent.py on the Macs' localhost, reached through SSH; 0 runs `say` over SSH exec for every job.
+MAC_AGENT_PORT = int(os.getenv("MAC_AGENT_PORT", "0"))
+MAC_AGENT_TIMEOUT = float(os.getenv("MAC_AGENT_TIMEOUT", "120"))
+# Seconds to use SSH exec on a Mac after its agent could not be reached.
+MAC_AGENT_RETRY = float(os.getenv("MAC_AGENT_RETRY", "60"))
@@ -12,4 +12,15 @@ MINIO_WORKING_PATH = os.getenv("MINIO_WORKING_PATH", "tmp")
 MINIO_PUBLIC_URL = os.getenv("MINIO_PUBLIC_URL", "http://localhost:9000")
 
 MINIO_BUCKET_EXPIRATION = int(os.getenv("MINIO_BUCKET_EXPIRATION", "1"))
-MINIO_BUCKET_ANONYMOUS = os.getenv("MINIO_BUCKET_ANONYMOUS", "true").lower() in ("true", "1", "t")
\ No newline at end of file
+MINIO_BUCKET_ANONYMOUS = os.getenv("MINIO_BUCKET_ANONYMOUS", "true").lower() in ("true", "1", "t")
+MINIO_PART_SIZE = int(os.getenv("MINIO_PART_SIZE", str(10 * 1024 * 1024)))
+# Parallel requests for bulk deletes, uploads and downloads.
+MINIO_BULK_WORKERS = int(os.getenv("MINIO_BULK_WORKERS", "8"))
+# Limits for setting/prune_cache.py on MINIO_WORKING_PATH; 0 disables a limit.
+MINIO_CACHE_MAX_AGE_DAYS = float(os.getenv("MINIO_CACHE_MAX_AGE_DAYS", "0"))
+MINIO_CACHE_MAX_BYTES = int(os.getenv("MINIO_CACHE_MAX_BYTES", "0"))
+# Direct transfer: the Macs fetch text and upload audio themselves through presigned URLs.
+MINIO_DIRECT_TRANSFER = os.getenv("MINIO_DIRECT_TRANSFER", "false").lower() in ("true", "1", "t")
+# MinIO address as the Macs reach it; presigned URLs are signed for this host.
+MINIO_MAC_ENDPOINT = os.getenv("MINIO_MAC_ENDPOINT", "") or MINIO_ENDPOINT
+MINIO_PRESIGN_EXPIRY = int(os.getenv("MINIO_PRESIGN_EXPIRY", "900"))
@@ -0,0 +1,43 @@
+# config/tts_setting.py
+
+import os
+
+TTS_VOICE = os.getenv("TTS_VOICE", "")
+TTS_RATE = int(os.getenv("TTS_RATE", "0"))
+TTS_FORMAT = os.getenv("TTS_FORMAT", "aiff")
+# Bitrate in kbps for compressed formats (m4a, mp3, opus).
+TTS_BITRATE = int(os.getenv("TTS_BITRATE", "64"))
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() in ("true", "1", "t")
+# Threads for synthesis and uploads; also caps the jobs admitted at once, so size it to MAC_MAX_INFLIGHT x Macs.
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "8"))
+# Threads for cache lookups and MinIO reads, kept apart so cache hits never wait behind syntheses.
+TTS_LOOKUP_WORKERS = int(os.getenv("TTS_LOOKUP_WORKERS", "4"))
+# Seconds before retrying a MinIO or Mac connection that failed; clients are created lazily.
+TTS_CLIENT_RETRY = float(os.getenv("TTS_CLIENT_RETRY", "10"))
+# Jobs waiting for a Mac beyond this are rejected with a retry-after hint instead of queueing.
+TTS_MAX_QUEUE = int(os.getenv("TTS_MAX_QUEUE", "200"))
+# Texts up to this many characters are admitted ahead of longer texts, batches and queued jobs.
+TTS_INTERACTIVE_CHARS = int(os.getenv("TTS_INTERACTIVE_CHARS", "500"))
+# Texts longer than this many characters are split and synthesized in parallel; 0 disables chunking.
+TTS_CHUNK_SIZE = int(os.getenv("TTS_CHUNK_SIZE", "2000"))
+TTS_CHUNK_WORKERS = int(os.getenv("TTS_CHUNK_WORKERS", "4"))
+# Job mode: SQLite file for job state (defaults to LOCAL_WORKING_PATH/tts_jobs.sqlite3), worker count and queue bound.
+TTS_JOB_DB = os.getenv("TTS_JOB_DB", "")
+TTS_JOB_WORKERS = int(os.getenv("TTS_JOB_WORKERS", "2"))
+TTS_JOB_QUEUE_SIZE = int(os.getenv("TTS_JOB_QUEUE_SIZE", "100"))
+# Local LRU disk cache in front of MinIO for source texts and audio (defaults to LOCAL_WORKING_PATH/tts_cache); off unless
+# TTS_LOCAL_CACHE_BYTES is set. LOCAL_WORKING_PATH is usually a small tmpfs meant to hold no audio, so point
+# TTS_LOCAL_CACHE_PATH at a volume with room for TTS_LOCAL_CACHE_BYTES before enabling it.
+TTS_LOCAL_CACHE_PATH = os.getenv("TTS_LOCAL_CACHE_PATH", "")
+TTS_LOCAL_CACHE_BYTES = int(os.getenv("TTS_LOCAL_CACHE_BYTES", "0"))
+# Serve cached audio over HTTP at {TTS_AUDIO_ROUTE}/{hash}.{ext}, with range requests; empty disables the route.
+TTS_AUDIO_ROUTE = os.getenv("TTS_AUDIO_ROUTE", "")
+# Streaming mode (say with stream=true, HTTP transport only): the URL {TTS_PUBLIC_URL}{TTS_STREAM_ROUTE}/{hash}.aiff
+# plays segments of about TTS_STREAM_SEGMENT_CHARS as they finish; an empty route disables it.
+TTS_STREAM_ROUTE = os.getenv("TTS_STREAM_ROUTE", "")
+TTS_PUBLIC_URL = os.getenv("TTS_PUBLIC_URL", f"http://localhost:{os.getenv('PORT', 8000)}")
+TTS_STREAM_SEGMENT_CHARS = int(os.getenv("TTS_STREAM_SEGMENT_CHARS", "300"))
+# Seconds a finished stream stays in memory for late listeners; after that its URL redirects to MinIO.
+TTS_STREAM_TTL = float(os.getenv("TTS_STREAM_TTL", "300"))
+# A stream that waits longer than this many seconds for its next segment fails, so listeners are not left hanging; 0 waits forever.
+TTS_STREAM_SEGMENT_TIMEOUT = float(os.getenv("TTS_STREAM_SEGMENT_TIMEOUT", "120"))
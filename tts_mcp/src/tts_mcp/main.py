@@ -1,27 +1,146 @@
 # main.py
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
+import asyncio
+from starlette.requests import Request
+from starlette.responses import FileResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse
 import tts_mcp.config as config
 import tts_mcp.tools as tools
+from tts_mcp.utils.metrics import registry
 
 mcp = FastMCP("tts_mcp", host=config.HOST, port=config.PORT)
 
+if config.METRICS_ENABLED:
+    @mcp.custom_route(config.METRICS_PATH, methods=["GET"])
+    async def metrics(request: Request) -> PlainTextResponse:
+        """Prometheus scrape endpoint, served next to the MCP HTTP transport."""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+if config.TTS_AUDIO_ROUTE:
+    @mcp.custom_route(config.TTS_AUDIO_ROUTE.rstrip("/") + "/{name}", methods=["GET", "HEAD"])
+    async def audio(request: Request) -> Response:
+        """Serve generated audio from the local disk cache; FileResponse handles Range requests."""
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(None, tools.cached_audio, request.path_params["name"])
+        if entry is None:
+            return PlainTextResponse("Not found", status_code=404)
+        return FileResponse(entry["path"], media_type=entry["content_type"])
+
+if config.TTS_STREAM_ROUTE:
+    @mcp.custom_route(config.TTS_STREAM_ROUTE.rstrip("/") + "/{name}", methods=["GET"])
+    async def stream(request: Request) -> Response:
+        """Play audio from say(stream=true) while it is synthesized; once the stream has expired, redirect to MinIO."""
+        name = request.path_params["name"]
+        audio_stream = tools.get_stream(name)
+        if audio_stream is None:
+            url = await tools.finished_audio_url_async(name)
+            if url is None:
+                return PlainTextResponse("Not found", status_code=404)
+            return RedirectResponse(url)
+        if not await audio_stream.ready():
+            return PlainTextResponse(f"Synthesis failed: {audio_stream.error}", status_code=502)
+        return StreamingResponse(audio_stream.read(), media_type="audio/aiff", headers={"Cache-Control": "no-store"})
+
+if config.METRICS_OTEL and not registry.enable_otel():
+    config.logger.warning("METRICS_OTEL is set but opentelemetry is not installed; install the 'otel' extra.")
+
+def _bind_client(ctx: Context) -> None:
+    """Tell the admission queue who this call is for: the client id from the request, else its session."""
+    if ctx is None:
+        return
+    try:
+        client = ctx.client_id
+        request = ctx.request_context.request
+        if not client and request is not None:
+            client = request.headers.get("mcp-session-id")
+        tools.current_client.set(client or f"session-{id(ctx.session):x}")
+    except Exception as e:
+        config.logger.debug("No client identity for request: %s", e)
+
 @mcp.tool()
-def say(text: str) -> str:
-    """Generate speech audio from raw text and return the public MinIO URL of the audio file."""
+async def say(text: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None, stream: bool = False, ctx: Context = None) -> str:
+    """Generate speech audio from raw text and return the public MinIO URL of the audio file. Formats: aiff, wav, m4a, mp3, opus; bitrate is in kbps. With stream, return at once a URL that plays AIFF audio while it is generated."""
     config.logger.info("Received text: %s...", text[:20])
-    return tools.say(text)
+    _bind_client(ctx)
+    if stream:
+        return await tools.say_stream_async(text, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+    return await tools.say_async(text, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
 
 @mcp.tool()
-def tts(url: str) -> str:
-    """Generate speech audio from MinIO URL and return the public MinIO URL of the audio file."""
+async def tts(url: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None, ctx: Context = None) -> str:
+    """Generate speech audio from MinIO URL and return the public MinIO URL of the audio file. Formats: aiff, wav, m4a, mp3, opus; bitrate is in kbps."""
     config.logger.info("Received URL: %s", url)
-    return tools.tts(url)
+    _bind_client(ctx)
+    return await tools.tts_async(url, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+
+@mcp.tool()
+async def say_batch(texts: list[str], voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None, ctx: Context = None) -> list[str | None]:
+    """Generate speech audio for many texts at once and return their public MinIO URLs in input order, with null for texts that failed. Each URL, or the error of a failed text, is also sent as a progress notification as soon as it is ready."""
+    config.logger.info("Received batch of %d texts", len(texts))
+    _bind_client(ctx)
+
+    async def on_result(done: int, total: int, message: str) -> None:
+        if ctx:
+            await ctx.report_progress(done, total, message)
+
+    return await tools.say_batch_async(texts, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate, on_result=on_result)
+
+@mcp.tool()
+async def submit_say(text: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> dict:
+    """Queue speech generation for raw text and return the job (its id is the content hash). Finished audio is returned immediately."""
+    config.logger.info("Received job text: %s...", text[:20])
+    return await tools.submit_say_async(text, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+
+@mcp.tool()
+async def submit_tts(url: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> dict:
+    """Queue speech generation for a MinIO text URL and return the job (its id is the content hash)."""
+    config.logger.info("Received job URL: %s", url)
+    return await tools.submit_tts_async(url, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+
+@mcp.tool()
+async def job_status(job_id: str) -> dict:
+    """Return the status (queued, running, done, failed) and URL of a submitted job."""
+    return await tools.job_status_async(job_id)
+
+@mcp.tool()
+async def job_result(job_id: str, timeout: float = 30, ctx: Context = None) -> dict:
+    """Wait up to timeout seconds for a submitted job to finish, sending progress notifications as its status changes."""
+
+    async def on_progress(progress: float, total: float, message: str) -> None:
+        if ctx:
+            await ctx.report_progress(progress, total, message)
+
+    return await tools.job_result_async(job_id, timeout=timeout, on_progress=on_progress)
+
+@mcp.tool()
+def cache_stats() -> dict:
+    """Return the audio cache hit/miss counters."""
+    return tools.cache_stats()
+
+@mcp.tool()
+def queue_stats() -> dict:
+    """Return the syntheses holding a Mac slot, the slot capacity and the jobs queued per priority class."""
+    return tools.queue_stats()
+
+async def serve() -> None:
+    # The job queue lives on the server's event loop; start it with the server
+    # so jobs queued before a restart resume without waiting for a job call.
+    tools.start_job_queue()
+    if config.TRANSPORT == "stdio":
+        await mcp.run_stdio_async()
+    elif config.TRANSPORT == "sse":
+        await mcp.run_sse_async()
+    elif config.TRANSPORT == "streamable-http":
+        await mcp.run_streamable_http_async()
+    else:
+        raise ValueError(f"Unknown transport: {config.TRANSPORT}")
 
 if __name__ == "__main__":
+    # Connect in the background; requests that arrive first connect on demand.
+    tools.warm_up()
     try:
         # Runs the server
-        mcp.run(transport=config.TRANSPORT)
+        asyncio.run(serve())
     except KeyboardInterrupt:
         # Handles CTRL+C gracefully
         config.logger.info("\nServer stopped by user.")
\ No newline at end of file
@@ -12,7 +12,7 @@ def main():
             logger=config.logger
         )
         if minio_client.exists_bucket():
-            minio_client.delete_bucket(force=True)
+            minio_client.delete_bucket(force=True, workers=config.MINIO_BULK_WORKERS)
         minio_client.create_bucket(expiration=config.MINIO_BUCKET_EXPIRATION, anonymous=config.MINIO_BUCKET_ANONYMOUS)
     except Exception as e:
         config.logger.error(f"Failed to initialize MinIO bucket: {str(e)}")
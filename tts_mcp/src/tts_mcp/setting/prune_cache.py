@@ -0,0 +1,35 @@
+import tts_mcp.config as config
+import tts_mcp.clients as clients
+
+AUDIO_OBJECT_PATTERN = r"^[0-9a-f]{32}\.(aiff|wav|m4a|mp3|ogg)$"
+
+def main():
+    try:
+        minio_client = clients.MinioClient(
+            endpoint=config.MINIO_ENDPOINT,
+            access_key=config.MINIO_ACCESS_KEY,
+            secret_key=config.MINIO_SECRET_KEY,
+            secure=config.MINIO_SECURE,
+            bucket=config.MINIO_BUCKET,
+            logger=config.logger
+        )
+        if not config.MINIO_CACHE_MAX_AGE_DAYS and not config.MINIO_CACHE_MAX_BYTES:
+            config.logger.info("Neither MINIO_CACHE_MAX_AGE_DAYS nor MINIO_CACHE_MAX_BYTES is set; nothing to prune.")
+            return
+        # An empty working path would make the whole bucket the cache.
+        if not config.MINIO_WORKING_PATH.strip("/"):
+            raise ValueError("MINIO_WORKING_PATH is empty; refusing to prune the whole bucket.")
+        minio_client.prune(
+            prefix=config.MINIO_WORKING_PATH,
+            # Only cached audio, named {hash}.{ext}; uploaded texts and anything else stay.
+            pattern=AUDIO_OBJECT_PATTERN,
+            max_age=config.MINIO_CACHE_MAX_AGE_DAYS * 86400 if config.MINIO_CACHE_MAX_AGE_DAYS else None,
+            max_bytes=config.MINIO_CACHE_MAX_BYTES or None,
+            workers=config.MINIO_BULK_WORKERS
+        )
+    except Exception as e:
+        config.logger.error(f"Failed to prune MinIO cache: {str(e)}")
+        raise
+
+if __name__ == "__main__":
+    main()
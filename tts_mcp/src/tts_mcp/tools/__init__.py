@@ -1,3 +1,6 @@
 from .tts import *
+from .batch import say_batch_async
+from .jobs import submit_say_async, submit_tts_async, job_status_async, job_result_async, start_job_queue
+from .stream import say_stream_async, get_stream, finished_audio_url_async
 
-__all__ = ["say", "tts"]
+__all__ = ["say", "tts", "say_async", "tts_async", "say_batch_async", "submit_say_async", "submit_tts_async", "job_status_async", "job_result_async", "start_job_queue", "say_stream_async", "get_stream", "finished_audio_url_async", "cache_stats", "queue_stats", "warm_up", "cached_audio"]
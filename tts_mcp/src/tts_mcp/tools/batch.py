@@ -0,0 +1,52 @@
+# tools/batch.py
+
+from typing import Awaitable, Callable
+import asyncio
+import tts_mcp.config as config
+from .tts import BULK, AudioJob, _check_clients_async, _prepare_job, _resolve_async
+
+async def say_batch_async(texts: list[str], voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None, on_result: Callable[[int, int, str], Awaitable[None]] = None) -> list[str | None]:
+    """Synthesize many texts in one call, each distinct text once, and return the URLs in input order.
+
+    A text that fails gets None in its place instead of failing the batch.
+    on_result(done, total, message) is awaited as each text finishes, with
+    the URL or "error: ..." as the message.
+    """
+    await _check_clients_async()
+    jobs = [_prepare_job(text, voice, rate, format, bitrate) for text in texts]
+    unique_jobs = {job.hash: job for job in jobs}
+    config.logger.info("Received batch of %d texts (%d unique)", len(jobs), len(unique_jobs))
+
+    # Batches queue behind interactive requests, and only a few of their
+    # texts wait for a Mac at once so a large batch cannot fill the queue.
+    pending = asyncio.Semaphore(config.TTS_MAX_WORKERS)
+
+    async def resolve(job: AudioJob) -> tuple[AudioJob, Exception]:
+        try:
+            async with pending:
+                await _resolve_async(job, use_cache, priority=BULK)
+        except Exception as e:
+            config.logger.error("Failed to say batch text %s: %s", job.hash, e)
+            return job, e
+        return job, None
+
+    urls = {}
+    done = 0
+    # Cache lookups and syntheses overlap on the shared executor and Mac pools.
+    tasks = [asyncio.ensure_future(resolve(job)) for job in unique_jobs.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            job, error = await next_done
+            done += 1
+            urls[job.hash] = None if error else job.minio_url
+            if on_result:
+                try:
+                    await on_result(done, len(unique_jobs), f"error: {error}" if error else job.minio_url)
+                except Exception as e:
+                    # A lost progress notification must not fail the batch.
+                    config.logger.warning("Failed to report batch progress: %s", e)
+    finally:
+        # Nobody is left to collect the rest if the call itself is cancelled.
+        for task in tasks:
+            task.cancel()
+    return [urls[job.hash] for job in jobs]
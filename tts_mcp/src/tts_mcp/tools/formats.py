@@ -0,0 +1,64 @@
+# tools/formats.py
+
+from typing import NamedTuple
+import mimetypes
+import shlex
+
+class AudioFormat(NamedTuple):
+    extension: str
+    content_type: str
+    # Extra `say` options for formats say can write itself.
+    say_options: str = ""
+    # ffmpeg encoder on the Mac for formats say cannot write; say renders AIFF first.
+    encoder: str = ""
+    # Whether the format takes a bitrate at all.
+    compressed: bool = False
+
+AUDIO_FORMATS = {
+    "aiff": AudioFormat("aiff", "audio/aiff"),
+    "wav": AudioFormat("wav", "audio/wav", say_options="--file-format=WAVE --data-format=LEI16"),
+    "m4a": AudioFormat("m4a", "audio/mp4", say_options="--file-format=m4af --data-format=aac", compressed=True),
+    "mp3": AudioFormat("mp3", "audio/mpeg", encoder="libmp3lame", compressed=True),
+    "opus": AudioFormat("ogg", "audio/ogg", encoder="libopus", compressed=True),
+}
+
+# Register the types so uploads that name no content type (MinioClient guesses from the object name) still get these.
+for _audio_format in AUDIO_FORMATS.values():
+    mimetypes.add_type(_audio_format.content_type, f".{_audio_format.extension}")
+
+def get_format(name: str) -> AudioFormat:
+    audio_format = AUDIO_FORMATS.get((name or "").lower())
+    if audio_format is None:
+        raise ValueError(f"Unsupported audio format '{name}'. Supported formats: {', '.join(AUDIO_FORMATS)}")
+    return audio_format
+
+def content_type_for(path: str) -> str:
+    extension = path.rpartition(".")[2].lower()
+    for audio_format in AUDIO_FORMATS.values():
+        if audio_format.extension == extension:
+            return audio_format.content_type
+    return "application/octet-stream"
+
+def say_command(name: str, mac_audio: str, voice: str = "", rate: int = 0, bitrate: int = 0, ffmpeg: str = "ffmpeg") -> str:
+    """Build the shell command that reads text from stdin and leaves the encoded audio at mac_audio."""
+    audio_format = get_format(name)
+    # "-f -" makes say read the text from stdin, so no text file lands on either side.
+    say = "say -f -"
+    if voice:
+        say += f" -v {shlex.quote(voice)}"
+    if rate:
+        say += f" -r {int(rate)}"
+    if not audio_format.encoder:
+        say += f" -o {shlex.quote(mac_audio)}"
+        if audio_format.say_options:
+            say += f" {audio_format.say_options}"
+        if audio_format.compressed and bitrate:
+            say += f" --bit-rate={int(bitrate) * 1000}"
+        return say
+    # Transcode on the Mac so only compressed audio ever crosses the network.
+    intermediate = shlex.quote(f"{mac_audio}.aiff")
+    encode = f"{ffmpeg} -y -loglevel error -i {intermediate} -c:a {audio_format.encoder}"
+    if bitrate:
+        encode += f" -b:a {int(bitrate)}k"
+    encode += f" {shlex.quote(mac_audio)}"
+    return f"{say} -o {intermediate} && {encode}; status=$?; rm -f {intermediate}; exit $status"
@@ -0,0 +1,164 @@
+# tools/jobs.py
+
+from typing import Awaitable, Callable
+import asyncio
+import os
+import tts_mcp.config as config
+from tts_mcp.utils import JobStore, Overloaded
+from tts_mcp.utils.metrics import registry
+from .tts import BULK, current_client, _check_clients_async, _lookup_cache, _lookup_executor, _prepare_job, _read_text_async, _resolve_async
+
+class JobQueue:
+    """Run synthesis jobs on a bounded asyncio queue, keyed by content hash and tracked in a JobStore."""
+
+    def __init__(self, store: JobStore, workers: int = 2, max_size: int = 100) -> None:
+        self.store = store
+        self.workers = max(1, int(workers))
+        self.max_size = max_size
+        self._queue: asyncio.Queue = None
+        self._tasks: list[asyncio.Task] = []
+        self._events: dict[str, asyncio.Event] = {}
+
+    def _ensure_started(self) -> None:
+        # The queue and workers must be created inside the server's event loop.
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        # Workers share one client lane in admission, whoever submitted the jobs.
+        token = current_client.set("jobs")
+        try:
+            for _ in range(self.workers):
+                self._tasks.append(asyncio.create_task(self._worker()))
+        finally:
+            current_client.reset(token)
+        # Resume jobs that were queued or running when the server stopped.
+        for row in self.store.pending():
+            try:
+                self._queue.put_nowait(row["id"])
+                self.store.update(row["id"], JobStore.QUEUED)
+            except asyncio.QueueFull:
+                self.store.update(row["id"], JobStore.FAILED, error="Job queue was full when resuming after restart")
+        config.logger.info("Job queue started with %d workers", self.workers)
+
+    def _notify(self, id: str) -> None:
+        event = self._events.pop(id, None)
+        if event:
+            event.set()
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, request: dict) -> dict:
+        self._ensure_started()
+        job = _prepare_job(request["text"], request.get("voice"), request.get("rate"), request.get("format"), request.get("bitrate"))
+        existing = self.store.get(job.hash)
+        if existing and existing["status"] in (JobStore.QUEUED, JobStore.RUNNING):
+            return existing
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(_lookup_executor, _lookup_cache, job, request.get("use_cache", True)):
+            self.store.put(job.hash, request, status=JobStore.DONE)
+            self.store.update(job.hash, JobStore.DONE, url=job.minio_url)
+            return self.store.get(job.hash)
+        if self._queue.full():
+            raise RuntimeError(f"Job queue is full ({self.max_size} jobs). Retry later.")
+        self.store.put(job.hash, request)
+        self._queue.put_nowait(job.hash)
+        return self.store.get(job.hash)
+
+    async def _worker(self) -> None:
+        while True:
+            id = await self._queue.get()
+            try:
+                row = self.store.get(id)
+                if row is None or row["status"] != JobStore.QUEUED:
+                    continue
+                request = row["request"]
+                job = _prepare_job(request["text"], request.get("voice"), request.get("rate"), request.get("format"), request.get("bitrate"))
+                self.store.update(id, JobStore.RUNNING)
+                self._notify(id)
+                # Jobs resumed at startup may run before any call has connected the clients.
+                await _check_clients_async()
+                while True:
+                    try:
+                        await _resolve_async(job, request.get("use_cache", True), priority=BULK)
+                        break
+                    except Overloaded as e:
+                        # Queued jobs have no caller waiting; hold on to the job instead of failing it.
+                        config.logger.info("Job %s deferred: %s", id, e)
+                        await asyncio.sleep(e.retry_after)
+                self.store.update(id, JobStore.DONE, url=job.minio_url)
+                config.logger.info("Job %s done: %s", id, job.minio_url)
+            except Exception as e:
+                config.logger.error("Job %s failed: %s", id, e)
+                self.store.update(id, JobStore.FAILED, error=str(e))
+            finally:
+                self._notify(id)
+                self._queue.task_done()
+
+    async def wait(self, id: str, timeout: float = 0, on_progress: Callable[[dict], Awaitable[None]] = None) -> dict:
+        """Return the job once it finishes or timeout seconds pass, calling on_progress on every status change."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0, timeout)
+        last_status = None
+        while True:
+            row = self.store.get(id)
+            if row is None:
+                raise ValueError(f"Unknown job '{id}'")
+            if on_progress and row["status"] != last_status:
+                last_status = row["status"]
+                await on_progress(row)
+            remaining = deadline - loop.time()
+            if row["status"] in (JobStore.DONE, JobStore.FAILED) or remaining <= 0:
+                return row
+            event = self._events.setdefault(id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+_job_queue: JobQueue = None
+
+# Progress steps reported for a job: queued -> running -> finished.
+_PROGRESS = {JobStore.QUEUED: 0, JobStore.RUNNING: 1, JobStore.DONE: 2, JobStore.FAILED: 2}
+
+def _get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        path = config.TTS_JOB_DB or os.path.join(config.LOCAL_WORKING_PATH, "tts_jobs.sqlite3")
+        _job_queue = JobQueue(JobStore(path), workers=config.TTS_JOB_WORKERS, max_size=config.TTS_JOB_QUEUE_SIZE)
+    return _job_queue
+
+def start_job_queue() -> None:
+    """Start the job workers in the running event loop, resuming jobs left unfinished by a restart."""
+    _get_job_queue()._ensure_started()
+
+def _public(row: dict) -> dict:
+    return {"id": row["id"], "status": row["status"], "url": row["url"], "error": row["error"]}
+
+registry.gauge("tts_job_queue_depth", "Jobs waiting in the job queue.", callback=lambda: _job_queue.depth() if _job_queue else 0)
+
+async def submit_say_async(text: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> dict:
+    await _check_clients_async()
+    request = {"text": text, "voice": voice, "rate": rate, "use_cache": use_cache, "format": format, "bitrate": bitrate}
+    return _public(await _get_job_queue().submit(request))
+
+async def submit_tts_async(url: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> dict:
+    await _check_clients_async()
+    text = await _read_text_async(url)
+    return await submit_say_async(text, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+
+async def job_status_async(id: str) -> dict:
+    row = await _get_job_queue().wait(id)
+    return _public(row)
+
+async def job_result_async(id: str, timeout: float = 0, on_progress: Callable[[float, float, str], Awaitable[None]] = None) -> dict:
+    async def report(row: dict) -> None:
+        if on_progress:
+            try:
+                await on_progress(_PROGRESS[row["status"]], 2, row["status"])
+            except Exception as e:
+                config.logger.warning("Failed to report job progress: %s", e)
+
+    row = await _get_job_queue().wait(id, timeout=timeout, on_progress=report)
+    return _public(row)
@@ -0,0 +1,169 @@
+# tools/stream.py
+
+from typing import AsyncIterator
+import asyncio
+import io
+import re
+import time
+import tts_mcp.config as config
+from tts_mcp.utils import aiff_samples, aiff_stream_header, concat_aiff, split_text
+from tts_mcp.utils.metrics import registry, STAGE_SECONDS
+from .tts import AudioJob, _admission, _audio_exists, _check_clients_async, _check_minio, _executor, _lookup_cache, _lookup_executor, _observe_request, _prepare_job, _read_audio, _resolve_async, _upload_audio, say_async
+
+class AudioStream:
+    """AIFF audio of one text, handed to any number of listeners segment by segment as the Macs finish them."""
+
+    def __init__(self, job: AudioJob, segments: list[AudioJob]) -> None:
+        self.job = job
+        self.segments = segments
+        self.header: bytes = None
+        self.parts: list[bytes] = []
+        self.done = False
+        self.error: str = None
+        self.finished_at: float = None
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task = None
+
+    async def _publish(self, part: bytes) -> None:
+        async with self._changed:
+            if self.header is None:
+                self.header = aiff_stream_header(part)
+            self.parts.append(part)
+            self._changed.notify_all()
+
+    async def _finish(self, error: str = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self.finished_at = time.monotonic()
+            self._changed.notify_all()
+
+    async def run(self, use_cache: bool = True) -> None:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        # Segments start in order, a few at a time, so the first ones are not
+        # stuck behind the rest of the text in the admission queue.
+        window = asyncio.Semaphore(config.TTS_CHUNK_WORKERS)
+
+        async def render(segment: AudioJob) -> bytes:
+            async with window:
+                await _resolve_async(segment, use_cache)
+                return await loop.run_in_executor(_lookup_executor, _read_audio, segment.minio_audio)
+
+        tasks = [asyncio.create_task(render(segment)) for segment in self.segments]
+        timeout = config.TTS_STREAM_SEGMENT_TIMEOUT or None
+        try:
+            for segment, task in zip(self.segments, tasks):
+                try:
+                    part = await asyncio.wait_for(task, timeout)
+                except asyncio.TimeoutError:
+                    raise RuntimeError(f"No audio for segment '{segment.minio_audio}' within {timeout:g}s") from None
+                if part is None:
+                    raise RuntimeError(f"Failed to read segment '{segment.minio_audio}' from MinIO")
+                if not self.parts:
+                    STAGE_SECONDS.observe(time.perf_counter() - started, stage="stream_first_audio")
+                await self._publish(part)
+            # The whole text is stored as well, so the next request for it is a plain cache hit.
+            if self.segments[0].hash != self.job.hash:
+                audio = await loop.run_in_executor(_executor, concat_aiff, self.parts)
+                if not await loop.run_in_executor(_executor, _upload_audio, io.BytesIO(audio), len(audio), self.job):
+                    raise RuntimeError(f"Failed to upload audio to MinIO as '{self.job.minio_audio}'")
+            config.logger.info("Stream finished: %s", self.job.minio_url)
+            await self._finish()
+        except Exception as e:
+            config.logger.error("Failed to stream %s: %s", self.job.hash, e)
+            await self._finish(str(e))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Listeners wait for done, so it is set however run ends, even when cancelled.
+            if not self.done:
+                await self._finish("Stream was cancelled")
+
+    async def ready(self) -> bool:
+        """Wait for the first segment; False if the stream failed before producing any audio.
+
+        run finishes the stream once a segment is late by TTS_STREAM_SEGMENT_TIMEOUT, so this does not hang.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.parts or self.done)
+            return bool(self.parts)
+
+    async def read(self) -> AsyncIterator[bytes]:
+        """Yield the header and then the samples of each segment as it becomes available."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.parts) > sent or self.done)
+                parts = self.parts[sent:]
+                done = self.done
+            if sent == 0 and parts:
+                yield self.header
+            for part in parts:
+                yield aiff_samples(part)
+            sent += len(parts)
+            if done:
+                return
+
+# Streams by content hash; finished ones are dropped after TTS_STREAM_TTL.
+_streams: dict[str, AudioStream] = {}
+
+_STREAM_NAME = re.compile(r"^([0-9a-f]{32})\.aiff$")
+
+def _expire_streams() -> None:
+    now = time.monotonic()
+    for hash, stream in list(_streams.items()):
+        if stream.done and now - stream.finished_at > config.TTS_STREAM_TTL:
+            del _streams[hash]
+
+def _stream_url(job: AudioJob) -> str:
+    return f"{config.TTS_PUBLIC_URL.rstrip('/')}{config.TTS_STREAM_ROUTE.rstrip('/')}/{job.hash}.aiff"
+
+def get_stream(name: str) -> AudioStream:
+    """Return the stream behind a `{hash}.aiff` stream URL name, or None once it has expired or if unknown."""
+    match = _STREAM_NAME.match(name)
+    if match is None:
+        return None
+    _expire_streams()
+    return _streams.get(match.group(1))
+
+async def finished_audio_url_async(name: str) -> str:
+    """Return the MinIO URL for a stream URL name whose audio is complete, or None."""
+    if _STREAM_NAME.match(name) is None:
+        return None
+    minio_audio = f"{config.MINIO_WORKING_PATH}/{name}".lstrip("/")
+    loop = asyncio.get_running_loop()
+    # Only MinIO is needed here; a Mac being down must not break the redirect.
+    await loop.run_in_executor(_lookup_executor, _check_minio)
+    exists = await loop.run_in_executor(_lookup_executor, _audio_exists, minio_audio)
+    return f"{config.MINIO_PUBLIC_URL}/{config.MINIO_BUCKET}/{minio_audio}" if exists else None
+
+@_observe_request("say_stream")
+async def say_stream_async(text: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> str:
+    """Return a URL on this server that plays the audio while it is synthesized, or the MinIO URL if it is already cached.
+
+    Only AIFF is streamed; without a stream route or for other formats this is say_async.
+    """
+    if not config.TTS_STREAM_ROUTE or (format or config.TTS_FORMAT).lower() != "aiff":
+        return await say_async(text, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+    await _check_clients_async()
+    job = _prepare_job(text, voice, rate, "aiff")
+    _expire_streams()
+    stream = _streams.get(job.hash)
+    if stream is not None and not stream.error:
+        return _stream_url(job)
+    if await asyncio.get_running_loop().run_in_executor(_lookup_executor, _lookup_cache, job, use_cache):
+        return job.minio_url
+    segments = [_prepare_job(segment, job.voice, job.rate, "aiff") for segment in split_text(text, config.TTS_STREAM_SEGMENT_CHARS)]
+    if not segments:
+        return await say_async(text, voice=voice, rate=rate, use_cache=use_cache, format=format, bitrate=bitrate)
+    # Turn the caller away now rather than after handing out a URL.
+    _admission.check()
+    stream = AudioStream(job, segments)
+    _streams[job.hash] = stream
+    stream._task = asyncio.create_task(stream.run(use_cache))
+    config.logger.info("Streaming %d segments: %s", len(segments), _stream_url(job))
+    return _stream_url(job)
+
+registry.gauge("tts_streams_active", "Streams whose audio is still being synthesized.", callback=lambda: sum(1 for stream in _streams.values() if not stream.done))
@@ -1,16 +1,84 @@
 # tools/tts.py
 
-from tts_mcp.clients import MinioClient, MacSSHClient
+from tts_mcp.clients import MinioClient, MacFleet, MacReaper, MacSSHClient, MacAgentError, agent_audio
+from tts_mcp.utils import AdmissionController, DiskCache, SingleFlight, TeeReader, split_text, concat_aiff
+from tts_mcp.utils.metrics import registry, STAGE_SECONDS, REQUEST_SECONDS, CACHE_EVENTS_TOTAL, LOCAL_CACHE_EVENTS_TOTAL
+from .formats import content_type_for, get_format, say_command
 import tts_mcp.config as config
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+import asyncio
+import contextvars
 import hashlib
+import io
 import os
-import tempfile
+import re
+import shlex
+import functools
+import threading
+import time
+import uuid
 
 minio_client = None
-mac_ssh_client = None
+# Signs URLs for MinIO as the Macs reach it, in direct-transfer mode.
+minio_presigner = None
+mac_fleet = None
+mac_reaper = None
 
-try:
-    minio_client = MinioClient(
+
+# Identical requests share one synthesis; they would otherwise clobber each
+# other's {hash}.txt/{hash}.aiff files on the Mac.
+_flights = SingleFlight()
+
+# Blocking paramiko/minio work for the async tools runs here, so the event
+# loop stays free and at most TTS_MAX_WORKERS jobs touch the clients at once.
+_executor = ThreadPoolExecutor(max_workers=config.TTS_MAX_WORKERS, thread_name_prefix="tts")
+
+# Cache lookups, stats and reads are short; on their own pool a cache hit is
+# not queued behind syntheses holding every _executor thread.
+_lookup_executor = ThreadPoolExecutor(max_workers=config.TTS_LOOKUP_WORKERS, thread_name_prefix="tts-lookup")
+
+# Chunks of a long text get their own pool: a job waiting on its chunks must
+# not hold the only threads the chunks could run on.
+_chunk_executor = ThreadPoolExecutor(max_workers=config.TTS_CHUNK_WORKERS, thread_name_prefix="tts-chunk")
+
+# Syntheses the async tools start wait here for a Mac, interactive texts
+# first and clients taking turns; see _resolve_async. No more are admitted
+# than _executor has threads, or admitted jobs would queue again there.
+_admission = AdmissionController(lambda: min(mac_fleet.capacity(), config.TTS_MAX_WORKERS) if mac_fleet else 1, max_queue=config.TTS_MAX_QUEUE)
+INTERACTIVE, BULK = _admission.classes
+
+# Who a request is for, set per tool call by the server; used for fair queuing.
+current_client: contextvars.ContextVar[str] = contextvars.ContextVar("tts_client", default="anonymous")
+
+# Local disk tier in front of MinIO for source texts and audio; see _get_local_cache.
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+# Macs (by host:port id) whose say agent could not be reached, with the time to try it again.
+_agent_retry_at: dict[str, float] = {}
+
+class AudioJob(NamedTuple):
+    text: str
+    hash: str
+    voice: str
+    rate: int
+    file_format: str
+    bitrate: int
+    minio_audio: str
+    minio_url: str
+    # (bucket, object) of a text the Mac downloads itself in direct-transfer mode.
+    text_object: tuple = None
+
+# Clients are created on first use or by warm_up(), never at import: a Mac
+# that is down must not stall startup, and a failed connect is retried.
+# One lock per client, so waiting on a slow Mac does not hold up MinIO.
+_init_locks = {"minio": threading.Lock(), "mac": threading.Lock()}
+_init_retry_at = {"minio": 0.0, "mac": 0.0}
+
+def _init_minio() -> None:
+    global minio_client, minio_presigner
+    client = MinioClient(
         endpoint=config.MINIO_ENDPOINT,
         access_key=config.MINIO_ACCESS_KEY,
         secret_key=config.MINIO_SECRET_KEY,
@@ -18,108 +86,555 @@ try:
         bucket=config.MINIO_BUCKET,
         logger=config.logger
     )
-    minio_client.create_bucket(anonymous=True)
-except Exception as e:
-    config.logger.error("Failed to initialize Minio client: %s", e)
+    client.create_bucket(anonymous=True)
+    if config.MINIO_DIRECT_TRANSFER:
+        minio_presigner = MinioClient(
+            endpoint=config.MINIO_MAC_ENDPOINT,
+            access_key=config.MINIO_ACCESS_KEY,
+            secret_key=config.MINIO_SECRET_KEY,
+            secure=config.MINIO_SECURE,
+            bucket=config.MINIO_BUCKET,
+            region=config.MINIO_REGION,
+            logger=config.logger
+        )
+    minio_client = client
 
-try:
-    mac_ssh_client = MacSSHClient(
-        host=config.MAC_HOST,
+def _init_mac() -> None:
+    global mac_fleet, mac_reaper
+    fleet = MacFleet(
+        hosts=config.MAC_HOSTS,
         user=config.MAC_USER,
         password=config.MAC_PASSWORD,
         key_filename=config.MAC_SSH_FILE,
         port=config.MAC_PORT,
         working_path=config.MAC_WORKING_PATH,
+        connect_timeout=config.MAC_CONNECT_TIMEOUT,
+        pool_size=config.MAC_POOL_SIZE,
+        idle_timeout=config.MAC_POOL_IDLE_TIMEOUT,
+        checkout_timeout=config.MAC_POOL_CHECKOUT_TIMEOUT,
+        strategy=config.MAC_SCHEDULER,
+        max_attempts=config.MAC_MAX_ATTEMPTS,
+        max_inflight=config.MAC_MAX_INFLIGHT,
+        failure_threshold=config.MAC_FAILURE_THRESHOLD,
+        reset_timeout=config.MAC_RESET_TIMEOUT,
         logger=config.logger
     )
-except Exception as e:
-    config.logger.error("Failed to initialize Mac SSH client: %s", e)
+    # Remote files are named {hash}-{token}.{ext}; see _synthesize_on.
+    mac_reaper = MacReaper(
+        fleet,
+        working_path=config.MAC_WORKING_PATH,
+        pattern=r"^[0-9a-f]{32}-[0-9a-f]{8}\.",
+        interval=config.MAC_CLEANUP_INTERVAL,
+        max_age=config.MAC_CLEANUP_MAX_AGE,
+        logger=config.logger
+    )
+    mac_reaper.start()
+    mac_fleet = fleet
+
+def _ensure_clients(*names: str) -> None:
+    """Create whichever of the named clients (all by default) is missing, at most once per TTS_CLIENT_RETRY seconds each."""
+    if minio_client and mac_fleet:
+        return
+    for name, ready, init in (("minio", lambda: minio_client, _init_minio), ("mac", lambda: mac_fleet, _init_mac)):
+        if names and name not in names:
+            continue
+        with _init_locks[name]:
+            if ready() or time.monotonic() < _init_retry_at[name]:
+                continue
+            try:
+                init()
+            except Exception as e:
+                _init_retry_at[name] = time.monotonic() + config.TTS_CLIENT_RETRY
+                config.logger.error("Failed to initialize %s client, retrying in %ss: %s", "MinIO" if name == "minio" else "Mac SSH", config.TTS_CLIENT_RETRY, e)
+
+def warm_up() -> threading.Thread:
+    """Connect to MinIO and the Macs in the background so the first request does not pay for it."""
+    thread = threading.Thread(target=_ensure_clients, name="tts-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def _get_local_cache() -> DiskCache:
+    global _local_cache
+    if _local_cache is None and config.TTS_LOCAL_CACHE_BYTES > 0:
+        with _local_cache_lock:
+            if _local_cache is None:
+                path = config.TTS_LOCAL_CACHE_PATH or os.path.join(config.LOCAL_WORKING_PATH, "tts_cache")
+                _local_cache = DiskCache(path, config.TTS_LOCAL_CACHE_BYTES)
+    return _local_cache
+
+def _upload_audio(stream, length: int, job: AudioJob) -> bool:
+    """Upload audio to MinIO, keeping a copy in the local cache when it is enabled."""
+    content_type = get_format(job.file_format).content_type
+    cache = _get_local_cache()
+    if cache is None:
+        return minio_client.upload_stream(stream, length, job.minio_audio, content_type=content_type, part_size=config.MINIO_PART_SIZE)
+    # The local copy is best effort: a full or unwritable cache must not fail the job.
+    try:
+        writer = cache.writer(f"audio:{job.minio_audio}", content_type)
+    except OSError as e:
+        config.logger.warning("Local cache unavailable, uploading without it: %s", e)
+        return minio_client.upload_stream(stream, length, job.minio_audio, content_type=content_type, part_size=config.MINIO_PART_SIZE)
+    tee = TeeReader(stream, writer)
+    uploaded = False
+    try:
+        uploaded = minio_client.upload_stream(tee, length, job.minio_audio, content_type=content_type, part_size=config.MINIO_PART_SIZE)
+    finally:
+        try:
+            writer.close(commit=uploaded and not tee.failed)
+        except OSError as e:
+            config.logger.warning("Failed to keep %s in the local cache: %s", job.minio_audio, e)
+    return uploaded
 
+def _audio_exists(minio_audio: str) -> bool:
+    return minio_client.exists_file(minio_audio)
 
+def _read_audio(minio_audio: str) -> bytes:
+    cache = _get_local_cache()
+    if cache is None:
+        return minio_client.read_file(minio_audio)
+    # Audio keys are content hashes, so a cached copy never goes stale.
+    data = cache.get(f"audio:{minio_audio}")
+    if data is not None:
+        LOCAL_CACHE_EVENTS_TOTAL.inc(kind="audio", event="hits")
+        return data
+    LOCAL_CACHE_EVENTS_TOTAL.inc(kind="audio", event="misses")
+    data = minio_client.read_file(minio_audio)
+    if data is not None:
+        cache.put(f"audio:{minio_audio}", data, content_type_for(minio_audio))
+    return data
 
-def _generate_hash(text: str) -> str:
+def _read_text_object(bucket: str, object_name: str) -> bytes:
+    cache = _get_local_cache()
+    if cache is None:
+        return minio_client.read_file(object_name, bucket=bucket)
+    # Text objects can be overwritten, so a cached copy is only used while its ETag still matches.
+    info = minio_client.stat_file(object_name, bucket=bucket)
+    if info is None:
+        return None
+    key = f"text:{bucket}/{object_name}"
+    data = cache.get(key, tag=info["etag"])
+    if data is not None:
+        LOCAL_CACHE_EVENTS_TOTAL.inc(kind="text", event="hits")
+        return data
+    LOCAL_CACHE_EVENTS_TOTAL.inc(kind="text", event="misses")
+    data = minio_client.read_file(object_name, bucket=bucket)
+    if data is not None:
+        cache.put(key, data, info["content_type"], tag=info["etag"])
+    return data
+
+_AUDIO_NAME = re.compile(r"^[0-9a-f]{32}\.[a-z0-9]+$")
+
+def cached_audio(name: str) -> dict:
+    """Return {path, size, content_type} of generated audio `{hash}.{ext}` on local disk, fetching it from MinIO on a miss; None if unknown."""
+    cache = _get_local_cache()
+    if cache is None or not _AUDIO_NAME.match(name):
+        return None
+    minio_audio = f"{config.MINIO_WORKING_PATH}/{name}".lstrip("/")
+    entry = cache.lookup(f"audio:{minio_audio}")
+    if entry is not None:
+        LOCAL_CACHE_EVENTS_TOTAL.inc(kind="audio", event="hits")
+        return entry
+    _ensure_clients()
+    if not minio_client or _read_audio(minio_audio) is None:
+        return None
+    return cache.lookup(f"audio:{minio_audio}")
+
+def _generate_hash(text: str, voice: str = "", rate: int = 0, file_format: str = "aiff", bitrate: int = 0) -> str:
     try:
-        return hashlib.md5(text.encode()).hexdigest()
+        fields = [text, voice or "", str(rate or 0), file_format]
+        if bitrate:
+            fields.append(str(bitrate))
+        key = "\0".join(fields)
+        return hashlib.md5(key.encode()).hexdigest()
     except Exception as e:
         config.logger.error("Failed to generate hash: %s", e)
         raise e
 
-def _generate_audio(text: str) -> (str, str):
+def _count_cache(event: str) -> None:
+    CACHE_EVENTS_TOTAL.inc(event=event)
+
+def cache_stats() -> dict:
+    return {event: int(CACHE_EVENTS_TOTAL.value(event=event)) for event in ("hits", "misses", "bypassed")}
+
+def _observe_request(tool: str):
+    """Record the latency and outcome of a tool call, sync or async."""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started, outcome = time.perf_counter(), "error"
+                try:
+                    result = await fn(*args, **kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    REQUEST_SECONDS.observe(time.perf_counter() - started, tool=tool, outcome=outcome)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started, outcome = time.perf_counter(), "error"
+            try:
+                result = fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                REQUEST_SECONDS.observe(time.perf_counter() - started, tool=tool, outcome=outcome)
+        return wrapper
+    return decorator
+
+def _check_clients() -> None:
+    _ensure_clients()
     if not minio_client:
         raise RuntimeError("MinIO client is not initialized. Check server logs for startup errors.")
-    if not mac_ssh_client:
+    if not mac_fleet:
         raise RuntimeError("Mac SSH client is not initialized. Check server logs for startup errors.")
+
+def _prepare_job(text: str, voice: str = None, rate: int = None, file_format: str = None, bitrate: int = None) -> AudioJob:
+    voice = voice if voice is not None else config.TTS_VOICE
+    rate = rate if rate is not None else config.TTS_RATE
+    file_format = (file_format or config.TTS_FORMAT).lower()
+    audio_format = get_format(file_format)
+    bitrate = (bitrate if bitrate is not None else config.TTS_BITRATE) if audio_format.compressed else 0
+    hash = _generate_hash(text, voice, rate, file_format, bitrate)
+
+    minio_audio = f"{config.MINIO_WORKING_PATH}/{hash}.{audio_format.extension}"
+    minio_audio = minio_audio[1:] if minio_audio.startswith("/") else minio_audio
+    minio_url = f"{config.MINIO_PUBLIC_URL}/{config.MINIO_BUCKET}/{minio_audio}"
+    return AudioJob(text, hash, voice, rate, file_format, bitrate, minio_audio, minio_url)
+
+def _lookup_cache(job: AudioJob, use_cache: bool = True) -> bool:
+    # Content-addressed cache: the object key is derived from everything that
+    # affects the output, so an existing object is always a valid result.
+    if use_cache and config.TTS_CACHE_ENABLED:
+        with STAGE_SECONDS.time(stage="cache_lookup"):
+            hit = minio_client.exists_file(job.minio_audio)
+        if hit:
+            _count_cache("hits")
+            config.logger.info("Cache hit: %s", job.minio_url)
+            return True
+        _count_cache("misses")
+        config.logger.info("Cache miss: %s", job.hash)
+    else:
+        _count_cache("bypassed")
+    return False
+
+def _generate_audio(text: str, voice: str = None, rate: int = None, use_cache: bool = True, file_format: str = None, bitrate: int = None) -> (str, str):
+    _check_clients()
+    job = _prepare_job(text, voice, rate, file_format, bitrate)
+    if not _lookup_cache(job, use_cache):
+        _flights.do(job.hash, _synthesize, job, use_cache)
+    return job.hash, job.minio_url
+
+def _check_minio() -> None:
+    _ensure_clients("minio")
+    if not minio_client:
+        raise RuntimeError("MinIO client is not initialized. Check server logs for startup errors.")
+
+async def _check_clients_async() -> None:
+    # Connecting blocks, so only hop to the executor when a client is missing.
+    if not (minio_client and mac_fleet):
+        await asyncio.get_running_loop().run_in_executor(_executor, _check_clients)
+
+async def _generate_audio_async(text: str, voice: str = None, rate: int = None, use_cache: bool = True, file_format: str = None, bitrate: int = None) -> (str, str):
+    await _check_clients_async()
+    job = _prepare_job(text, voice, rate, file_format, bitrate)
+    await _resolve_async(job, use_cache)
+    return job.hash, job.minio_url
+
+def _priority(job: AudioJob) -> str:
+    # A text read by the Mac itself has unknown length; treat it as bulk.
+    if job.text is not None and len(job.text) <= config.TTS_INTERACTIVE_CHARS:
+        return INTERACTIVE
+    return BULK
+
+async def _resolve_async(job: AudioJob, use_cache: bool = True, priority: str = None) -> None:
+    loop = asyncio.get_running_loop()
+    if await loop.run_in_executor(_lookup_executor, _lookup_cache, job, use_cache):
+        return
+    priority = priority or _priority(job)
+    chunks = _chunks(job)
+    if chunks:
+        # The text holds no slot itself: each chunk queues for one, so a long
+        # text shares the Macs chunk by chunk and never waits on a flight
+        # (possibly queued behind it) while holding a slot.
+        await _flights.do_coroutine(job.hash, _synthesize_chunked_async, job, chunks, use_cache, priority)
+        return
+    # Only the caller that starts a synthesis queues for a slot; identical
+    # requests join it. A full queue raises Overloaded right away.
+    gate = functools.partial(_admission.slot, current_client.get(), priority)
+    await _flights.do_async(job.hash, _synthesize_single, job, executor=_executor, gate=gate)
+
+def queue_stats() -> dict:
+    return _admission.stats()
+
+def _chunks(job: AudioJob) -> list[str]:
+    """The chunks a long AIFF text is synthesized in, or None to synthesize it whole."""
+    if job.text is not None and config.TTS_CHUNK_SIZE > 0 and len(job.text) > config.TTS_CHUNK_SIZE and job.file_format == "aiff":
+        chunks = split_text(job.text, config.TTS_CHUNK_SIZE)
+        if len(chunks) > 1:
+            return chunks
+    return None
+
+def _synthesize(job: AudioJob, use_cache: bool = True) -> None:
+    chunks = _chunks(job)
+    if chunks:
+        _synthesize_chunked(job, chunks, use_cache)
+        return
+    _synthesize_single(job)
+
+def _synthesize_single(job: AudioJob) -> None:
+    # The fleet picks a Mac and hands over one pooled connection for the whole
+    # job, so every step reuses its SFTP session; failures retry on another Mac.
+    mac_fleet.run(lambda mac_ssh_client: _synthesize_on(mac_ssh_client, job))
+
+def _synthesize_chunk(job: AudioJob, use_cache: bool) -> None:
+    if not _lookup_cache(job, use_cache):
+        _flights.do(job.hash, _synthesize_single, job)
+
+def _chunk_jobs(job: AudioJob, chunks: list[str]) -> tuple[list[AudioJob], dict[str, AudioJob]]:
+    # Every chunk is cached under its own content hash, so editing one
+    # paragraph only re-synthesizes that paragraph.
+    chunk_jobs = [_prepare_job(chunk, job.voice, job.rate, job.file_format) for chunk in chunks]
+    unique_jobs = {chunk_job.hash: chunk_job for chunk_job in chunk_jobs}
+    config.logger.info("Synthesizing %d chunks (%d unique) for %s", len(chunk_jobs), len(unique_jobs), job.hash)
+    return chunk_jobs, unique_jobs
+
+def _synthesize_chunked(job: AudioJob, chunks: list[str], use_cache: bool) -> None:
+    chunk_jobs, unique_jobs = _chunk_jobs(job, chunks)
+    futures = [_chunk_executor.submit(_synthesize_chunk, chunk_job, use_cache) for chunk_job in unique_jobs.values()]
+    for future in futures:
+        future.result()
+    _join_chunks(job, chunk_jobs, unique_jobs)
+
+async def _synthesize_chunked_async(job: AudioJob, chunks: list[str], use_cache: bool, priority: str) -> None:
+    chunk_jobs, unique_jobs = _chunk_jobs(job, chunks)
+    # A few chunks at a time, so one text does not fill the admission queue.
+    window = asyncio.Semaphore(config.TTS_CHUNK_WORKERS)
+
+    async def resolve(chunk_job: AudioJob) -> None:
+        async with window:
+            # Chunks keep the priority of the whole text, however short each one is.
+            await _resolve_async(chunk_job, use_cache, priority)
+
+    tasks = [asyncio.ensure_future(resolve(chunk_job)) for chunk_job in unique_jobs.values()]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    await asyncio.get_running_loop().run_in_executor(_executor, _join_chunks, job, chunk_jobs, unique_jobs)
+
+def _join_chunks(job: AudioJob, chunk_jobs: list[AudioJob], unique_jobs: dict[str, AudioJob]) -> None:
+    parts = {}
+    with STAGE_SECONDS.time(stage="chunk_download"):
+        for hash, chunk_job in unique_jobs.items():
+            parts[hash] = _read_audio(chunk_job.minio_audio)
+            if parts[hash] is None:
+                raise RuntimeError(f"Failed to read chunk '{chunk_job.minio_audio}' from MinIO")
+    with STAGE_SECONDS.time(stage="chunk_concat"):
+        audio = concat_aiff([parts[chunk_job.hash] for chunk_job in chunk_jobs])
+    with STAGE_SECONDS.time(stage="upload"):
+        uploaded = _upload_audio(io.BytesIO(audio), len(audio), job)
+    if not uploaded:
+        raise RuntimeError(f"Failed to upload audio to MinIO as '{job.minio_audio}'")
+
+def _synthesize_with_agent(mac_ssh_client: MacSSHClient, job: AudioJob) -> bool:
+    """Synthesize through the say agent; returns False when the caller should fall back to SSH exec."""
+    host = mac_ssh_client.id
+    if time.monotonic() < _agent_retry_at.get(host, 0):
+        return False
+    streaming = False
+    started = time.perf_counter()
     try:
-        hash = _generate_hash(text)
-        
-        # Create temp file for text
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False, mode='w') as tmp_text:
-            tmp_text.write(text)
-            local_text = tmp_text.name
-        config.logger.info("Text saved to temp file: %s", local_text)
-
-        # Create temp file path for audio (we don't create the file yet, just the path)
-        # We can use the hash for the audio filename to keep it consistent or use another temp file
-        # Let's use a temp directory for the audio file to ensure cleanup
-        local_audio = os.path.join(tempfile.gettempdir(), f"{hash}.aiff")
-
-        mac_audio = f"{config.MAC_WORKING_PATH}/{hash}.aiff"
-        mac_text = f"{config.MAC_WORKING_PATH}/{hash}.txt"
-        minio_audio = f"{config.MINIO_WORKING_PATH}/{hash}.aiff"
-        minio_audio = minio_audio[1:] if minio_audio.startswith("/") else minio_audio
-        minio_url = f"{config.MINIO_PUBLIC_URL}/{config.MINIO_BUCKET}/{minio_audio}"
-
-        mac_ssh_client.upload_file(local_text, mac_text)
-        mac_ssh_client.run_command(f"say -f {mac_text} -o {mac_audio}")
-        mac_ssh_client.download_file(mac_audio, local_audio)
-        minio_client.upload_file(local_audio, minio_audio)
+        with agent_audio(mac_ssh_client, config.MAC_AGENT_PORT, job.text, job.voice, job.rate, timeout=config.MAC_AGENT_TIMEOUT) as (length, audio):
+            streaming = True
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage="say")
+            # The agent streams the AIFF over the tunnel straight into MinIO.
+            with STAGE_SECONDS.time(stage="upload"):
+                uploaded = _upload_audio(audio, length, job)
+    except MacAgentError as e:
+        config.logger.warning("Say agent on %s failed, falling back to exec: %s", host, e)
+        return False
+    except Exception as e:
+        if streaming:
+            # The agent died mid-transfer (a MacTransportError the upload passed
+            # on), so the fleet retries the job on another Mac.
+            raise e
+        config.logger.warning("Say agent on %s is unreachable, using exec for %ss: %s", host, config.MAC_AGENT_RETRY, e)
+        _agent_retry_at[host] = time.monotonic() + config.MAC_AGENT_RETRY
+        return False
+    if not uploaded:
+        raise RuntimeError(f"Failed to upload audio to MinIO as '{job.minio_audio}'")
+    return True
+
+def _synthesize_on(mac_ssh_client: MacSSHClient, job: AudioJob) -> None:
+    # The agent renders AIFF only; other formats need say's options or ffmpeg.
+    if config.MAC_AGENT_PORT and not config.MINIO_DIRECT_TRANSFER and job.file_format == "aiff" and _synthesize_with_agent(mac_ssh_client, job):
+        return
+    audio_format = get_format(job.file_format)
+    # A per-attempt token keeps a deferred rm of an earlier run of the same
+    # text from deleting this run's file.
+    mac_audio = f"{config.MAC_WORKING_PATH}/{job.hash}-{uuid.uuid4().hex[:8]}.{audio_format.extension}"
+    try:
+        command = say_command(job.file_format, mac_audio, job.voice, job.rate, job.bitrate, ffmpeg=config.MAC_FFMPEG)
+        if config.MINIO_DIRECT_TRANSFER:
+            command = _direct_command(job, command, mac_audio, audio_format.content_type)
+        leftovers = mac_reaper.take(mac_ssh_client.id)
+        if leftovers:
+            # Earlier jobs' files go in the same exec instead of extra SFTP round trips.
+            command = f"{MacReaper.rm_command(leftovers)}; {command}"
+        with STAGE_SECONDS.time(stage="direct" if config.MINIO_DIRECT_TRANSFER else "say"):
+            mac_ssh_client.run_command_with_input(command, (job.text or "").encode("utf-8"), check=True)
+        if config.MINIO_DIRECT_TRANSFER:
+            return
+        with STAGE_SECONDS.time(stage="stat"):
+            length = mac_ssh_client.file_size(mac_audio)
+        if length < 0:
+            raise RuntimeError(f"Audio file '{mac_audio}' was not created on {mac_ssh_client.id}")
+        # Stream the SFTP file handle straight into MinIO; nothing touches local disk.
+        with STAGE_SECONDS.time(stage="upload"), mac_ssh_client.open_file(mac_audio) as remote_audio:
+            uploaded = _upload_audio(remote_audio, length, job)
+        if not uploaded:
+            raise RuntimeError(f"Failed to upload audio to MinIO as '{job.minio_audio}'")
     except Exception as e:
         config.logger.error("Failed to generate audio: %s", e)
         raise e
     finally:
-        if 'local_text' in locals() and os.path.exists(local_text):
-            os.remove(local_text)
-        if 'local_audio' in locals() and os.path.exists(local_audio):
-            os.remove(local_audio)
-        if mac_ssh_client.exists_file(mac_text):
-            mac_ssh_client.delete_file(mac_text)
-        if mac_ssh_client.exists_file(mac_audio):
-            mac_ssh_client.delete_file(mac_audio)
-    return hash, minio_url
-
-def say(text: str) -> str:
+        # Removed by the next job on this Mac or by the reaper, after the URL is returned.
+        mac_reaper.defer(mac_ssh_client.id, mac_audio)
+
+def _direct_command(job: AudioJob, command: str, mac_audio: str, content_type: str) -> str:
+    """Wrap a say command so the Mac downloads the text and uploads the audio itself through presigned URLs."""
+    put_url = minio_presigner.presigned_put_url(job.minio_audio, expires=config.MINIO_PRESIGN_EXPIRY)
+    if put_url is None:
+        raise RuntimeError(f"Failed to presign upload of '{job.minio_audio}'")
+    source = ""
+    if job.text_object:
+        bucket, object_name = job.text_object
+        get_url = minio_presigner.presigned_get_url(object_name, bucket=bucket, expires=config.MINIO_PRESIGN_EXPIRY)
+        if get_url is None:
+            raise RuntimeError(f"Failed to presign download of '{object_name}'")
+        source = f"curl -fsS {shlex.quote(get_url)} | "
+    upload = f"curl -fsS -X PUT -H {shlex.quote('Content-Type: ' + content_type)} --upload-file {shlex.quote(mac_audio)} {shlex.quote(put_url)}"
+    # pipefail turns a failed download into a failed job rather than audio of empty input.
+    return f"set -o pipefail; {source}( {command} ) && {upload}"
+
+def _parse_minio_url(url: str) -> (str, str):
+    path = url.replace(config.MINIO_PUBLIC_URL, "", 1).lstrip("/")
+    bucket, _, object_name = path.partition("/")
+    return bucket, object_name
+
+def _prepare_object_job(url: str, voice: str = None, rate: int = None, file_format: str = None, bitrate: int = None) -> AudioJob:
+    bucket, object_name = _parse_minio_url(url)
+    with STAGE_SECONDS.time(stage="read_text"):
+        info = minio_client.stat_file(object_name, bucket=bucket)
+    if info is None:
+        raise RuntimeError(f"Failed to read text from '{url}'")
+    # The server never sees the text, so the cache key comes from the
+    # object's ETag (a content hash for single-part uploads).
+    job = _prepare_job(f"minio-etag:{info['etag']}", voice, rate, file_format, bitrate)
+    return job._replace(text=None, text_object=(bucket, object_name))
+
+@_observe_request("say")
+def say(text: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> str:
     try:
-        _, minio_url = _generate_audio(text)
+        _, minio_url = _generate_audio(text, voice=voice, rate=rate, use_cache=use_cache, file_format=format, bitrate=bitrate)
         config.logger.info("Audio generated: %s", minio_url)
         return minio_url
     except Exception as e:
         config.logger.error("Failed to say: %s", e)
         raise e
 
-def tts(url: str) -> str:
+@_observe_request("tts")
+def tts(url: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> str:
+    _ensure_clients()
     if not minio_client:
         raise RuntimeError("MinIO client is not initialized. Check server logs for startup errors.")
     try:
-        minio_text = url.replace(config.MINIO_PUBLIC_URL, "")
-        bucket = minio_text.split("/")[0]
-        minio_text = minio_text.replace(bucket, "")
-        
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp_text:
-            local_text = tmp_text.name
-        
-        minio_client.download_file(minio_text, local_text, bucket=bucket)
-        config.logger.info("Text downloaded to temp file: %s", local_text)
-
-        with open(local_text, "r") as f:
-            text = f.read()
+        if config.MINIO_DIRECT_TRANSFER:
+            _check_clients()
+            job = _prepare_object_job(url, voice, rate, format, bitrate)
+            if not _lookup_cache(job, use_cache):
+                _flights.do(job.hash, _synthesize, job, use_cache)
+            config.logger.info("Audio generated: %s", job.minio_url)
+            return job.minio_url
+
+        bucket, minio_text = _parse_minio_url(url)
+        with STAGE_SECONDS.time(stage="read_text"):
+            data = _read_text_object(bucket, minio_text)
+        if data is None:
+            raise RuntimeError(f"Failed to read text from '{url}'")
+        text = data.decode("utf-8")
         config.logger.info("Text loaded: %s", text)
 
-        _, minio_url = _generate_audio(text)
+        _, minio_url = _generate_audio(text, voice=voice, rate=rate, use_cache=use_cache, file_format=format, bitrate=bitrate)
         config.logger.info("Audio generated: %s", minio_url)
         return minio_url
     except Exception as e:
         config.logger.error("Failed to tts: %s", e)
         raise e
-    finally:
-        if 'local_text' in locals() and os.path.exists(local_text):
-            os.remove(local_text)
+
+@_observe_request("say")
+async def say_async(text: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> str:
+    try:
+        _, minio_url = await _generate_audio_async(text, voice=voice, rate=rate, use_cache=use_cache, file_format=format, bitrate=bitrate)
+        config.logger.info("Audio generated: %s", minio_url)
+        return minio_url
+    except Exception as e:
+        config.logger.error("Failed to say: %s", e)
+        raise e
+
+async def _read_text_async(url: str) -> str:
+    bucket, minio_text = _parse_minio_url(url)
+    loop = asyncio.get_running_loop()
+    with STAGE_SECONDS.time(stage="read_text"):
+        data = await loop.run_in_executor(_lookup_executor, _read_text_object, bucket, minio_text)
+    if data is None:
+        raise RuntimeError(f"Failed to read text from '{url}'")
+    text = data.decode("utf-8")
+    config.logger.info("Text loaded: %s", text)
+    return text
+
+@_observe_request("tts")
+async def tts_async(url: str, voice: str = None, rate: int = None, use_cache: bool = True, format: str = None, bitrate: int = None) -> str:
+    if not minio_client:
+        await asyncio.get_running_loop().run_in_executor(_executor, _ensure_clients)
+    if not minio_client:
+        raise RuntimeError("MinIO client is not initialized. Check server logs for startup errors.")
+    try:
+        if config.MINIO_DIRECT_TRANSFER:
+            await _check_clients_async()
+            loop = asyncio.get_running_loop()
+            job = await loop.run_in_executor(_lookup_executor, _prepare_object_job, url, voice, rate, format, bitrate)
+            await _resolve_async(job, use_cache)
+            config.logger.info("Audio generated: %s", job.minio_url)
+            return job.minio_url
+
+        text = await _read_text_async(url)
+        _, minio_url = await _generate_audio_async(text, voice=voice, rate=rate, use_cache=use_cache, file_format=format, bitrate=bitrate)
+        config.logger.info("Audio generated: %s", minio_url)
+        return minio_url
+    except Exception as e:
+        config.logger.error("Failed to tts: %s", e)
+        raise e
+
+def _fleet_gauge(field: str) -> dict:
+    return {(worker["host"],): worker[field] for worker in mac_fleet.stats()} if mac_fleet else {}
+
+def _pool_gauge() -> dict:
+    values = {}
+    for worker in (mac_fleet.stats() if mac_fleet else []):
+        for state in ("in_use", "idle"):
+            values[(worker["host"], state)] = worker["pool"][state]
+    return values
+
+registry.gauge("tts_inflight_syntheses", "Distinct syntheses currently running.", callback=_flights.in_flight)
+registry.gauge("tts_executor_queue_depth", "Blocking calls waiting for an executor thread.", callback=lambda: _executor._work_queue.qsize())
+registry.gauge("tts_lookup_executor_queue_depth", "Cache lookups and reads waiting for a lookup thread.", callback=lambda: _lookup_executor._work_queue.qsize())
+registry.gauge("tts_mac_outstanding_jobs", "Jobs currently assigned to each Mac.", ["host"], callback=lambda: _fleet_gauge("outstanding"))
+registry.gauge("tts_mac_available", "Whether a Mac's circuit breaker lets jobs through (1) or not (0).", ["host"], callback=lambda: {(w["host"],): int(w["state"] != "open") for w in (mac_fleet.stats() if mac_fleet else [])})
+registry.gauge("tts_ssh_pool_connections", "Pooled SSH connections per Mac by state.", ["host", "state"], callback=_pool_gauge)
+registry.gauge("tts_admission_queue_depth", "Syntheses waiting for a Mac slot by priority class.", ["priority"], callback=lambda: {(name,): depth for name, depth in _admission.stats()["queued"].items()})
+registry.gauge("tts_admission_in_flight", "Syntheses holding a Mac slot.", callback=lambda: _admission.stats()["in_flight"])
+registry.gauge("tts_local_cache_bytes", "Bytes held in the local disk cache.", callback=lambda: _local_cache.stats()["bytes"] if _local_cache else 0)
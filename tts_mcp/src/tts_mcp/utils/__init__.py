@@ -0,0 +1,9 @@
+from .singleflight import SingleFlight
+from .circuit_breaker import CircuitBreaker
+from .text import split_text
+from .audio import aiff_samples, aiff_stream_header, concat_aiff
+from .job_store import JobStore
+from .disk_cache import DiskCache, TeeReader
+from .admission import AdmissionController, Overloaded
+
+__all__ = ["SingleFlight", "CircuitBreaker", "split_text", "aiff_samples", "aiff_stream_header", "concat_aiff", "JobStore", "DiskCache", "TeeReader", "AdmissionController", "Overloaded"]
@@ -0,0 +1,117 @@
+# utils/admission.py
+
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Hashable
+import asyncio
+import math
+import time
+
+class Overloaded(RuntimeError):
+    """The admission queue is full; retry_after is a hint in seconds."""
+
+    def __init__(self, retry_after: float, depth: int) -> None:
+        self.retry_after = retry_after
+        self.depth = depth
+        super().__init__(f"Server is busy ({depth} jobs queued). Retry after {retry_after:.0f} seconds.")
+
+class AdmissionController:
+    """Bound concurrent work on an asyncio loop with priority classes and per-client fair queuing.
+
+    Classes are served in the given order; within a class, clients take turns
+    so one client's backlog cannot starve another. After max_streak grants in
+    a row to earlier classes, a waiting later class gets the next slot.
+    """
+
+    def __init__(self, capacity: Callable[[], int], max_queue: int = 100, classes: tuple[str, ...] = ("interactive", "bulk"), max_streak: int = 8) -> None:
+        self._capacity = capacity
+        self.max_queue = max_queue
+        self.classes = classes
+        self.max_streak = max_streak
+        self._queues: dict[str, OrderedDict[Hashable, deque]] = {name: OrderedDict() for name in classes}
+        self._depth = {name: 0 for name in classes}
+        self._in_flight = 0
+        self._streak = 0
+        # Moving average of how long a slot is held, for the retry-after hint.
+        self._hold = 1.0
+
+    def capacity(self) -> int:
+        return max(1, int(self._capacity()))
+
+    def queued(self) -> int:
+        return sum(self._depth.values())
+
+    def retry_after(self) -> float:
+        return max(1.0, math.ceil(self._hold * (self.queued() + 1) / self.capacity()))
+
+    def _next(self) -> asyncio.Future:
+        waiting = [name for name in self.classes if self._depth[name]]
+        name = waiting[0]
+        if len(waiting) > 1 and self._streak >= self.max_streak:
+            name = waiting[1]
+        self._streak = self._streak + 1 if name == waiting[0] and len(waiting) > 1 else 0
+        clients = self._queues[name]
+        client, waiters = next(iter(clients.items()))
+        future = waiters.popleft()
+        # The client moves to the back of its class.
+        del clients[client]
+        if waiters:
+            clients[client] = waiters
+        self._depth[name] -= 1
+        return future
+
+    def _dispatch(self) -> None:
+        while self.queued() and self._in_flight < self.capacity():
+            future = self._next()
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    def check(self) -> None:
+        """Raise Overloaded if a new waiter would be turned away."""
+        if self.queued() >= self.max_queue:
+            raise Overloaded(self.retry_after(), self.queued())
+
+    async def acquire(self, client: Hashable, priority: str) -> None:
+        if priority not in self._queues:
+            priority = self.classes[-1]
+        if not self.queued() and self._in_flight < self.capacity():
+            self._in_flight += 1
+            return
+        self.check()
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(client, deque()).append(future)
+        self._depth[priority] += 1
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller gave up: pass the slot on.
+                self.release()
+            else:
+                waiters = self._queues[priority].get(client)
+                if waiters and future in waiters:
+                    waiters.remove(future)
+                    self._depth[priority] -= 1
+                    if not waiters:
+                        del self._queues[priority][client]
+            raise
+
+    def release(self, held: float = None) -> None:
+        self._in_flight -= 1
+        if held is not None:
+            self._hold = 0.2 * held + 0.8 * self._hold
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, client: Hashable, priority: str) -> AsyncIterator[None]:
+        await self.acquire(client, priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def stats(self) -> dict:
+        return {"in_flight": self._in_flight, "capacity": self.capacity(), "queued": dict(self._depth), "max_queue": self.max_queue}
@@ -0,0 +1,76 @@
+# utils/audio.py
+
+import struct
+
+def _read_chunks(data: bytes) -> tuple[bytes, dict[bytes, bytes]]:
+    if len(data) < 12 or data[:4] != b"FORM" or data[8:12] not in (b"AIFF", b"AIFC"):
+        raise ValueError("Not an AIFF/AIFF-C file")
+    form_type = data[8:12]
+    chunks = {}
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        (size,) = struct.unpack(">I", data[offset + 4:offset + 8])
+        chunks.setdefault(chunk_id, data[offset + 8:offset + 8 + size])
+        offset += 8 + size + (size & 1)
+    if b"COMM" not in chunks or b"SSND" not in chunks:
+        raise ValueError("AIFF file is missing its COMM or SSND chunk")
+    return form_type, chunks
+
+def _chunk(chunk_id: bytes, body: bytes) -> bytes:
+    return chunk_id + struct.pack(">I", len(body)) + body + (b"\x00" if len(body) & 1 else b"")
+
+def _samples(chunks: dict[bytes, bytes]) -> bytes:
+    channels, frames, sample_size = struct.unpack(">hIh", chunks[b"COMM"][:8])
+    ssnd = chunks[b"SSND"]
+    (data_offset,) = struct.unpack(">I", ssnd[:4])
+    # Some writers count the pad byte in the SSND size; trust the frame count instead.
+    return ssnd[8 + data_offset:][:frames * channels * ((sample_size + 7) // 8)]
+
+def aiff_samples(data: bytes) -> bytes:
+    """Return the raw sample data of an uncompressed AIFF/AIFF-C file."""
+    _, chunks = _read_chunks(data)
+    return _samples(chunks)
+
+def aiff_stream_header(data: bytes) -> bytes:
+    """Return an AIFF header in the sample format of data, for samples of a length not yet known.
+
+    Sizes are set to the largest whole number of frames, the same convention
+    streamed WAV uses, so players read until the connection closes.
+    """
+    form_type, chunks = _read_chunks(data)
+    comm = chunks[b"COMM"]
+    channels, _, sample_size = struct.unpack(">hIh", comm[:8])
+    frame_size = channels * ((sample_size + 7) // 8)
+    fver = _chunk(b"FVER", chunks[b"FVER"]) if b"FVER" in chunks else b""
+    # FORM type + FVER + COMM + SSND header and offset/block size.
+    overhead = 4 + len(fver) + 8 + len(comm) + (len(comm) & 1) + 16
+    frames = (0xFFFFFFFF - overhead) // frame_size
+    comm_chunk = _chunk(b"COMM", comm[:2] + struct.pack(">I", frames) + comm[6:])
+    sound_size = frames * frame_size
+    body = form_type + fver + comm_chunk + b"SSND" + struct.pack(">III", 8 + sound_size, 0, 0)
+    return b"FORM" + struct.pack(">I", len(body) + sound_size) + body
+
+def concat_aiff(parts: list[bytes]) -> bytes:
+    """Join uncompressed AIFF/AIFF-C files that share one sample format into a single file."""
+    if not parts:
+        raise ValueError("Nothing to concatenate")
+    form_type, first = _read_chunks(parts[0])
+    # COMM is channels(2) frames(4) sample size(2) rate(10) [+ AIFF-C compression]; everything but frames must match.
+    comm_format = first[b"COMM"][:2] + first[b"COMM"][6:]
+    frames = 0
+    sound = []
+    for part in parts:
+        part_form, chunks = _read_chunks(part)
+        comm = chunks[b"COMM"]
+        if part_form != form_type or comm[:2] + comm[6:] != comm_format:
+            raise ValueError("AIFF parts have different sample formats")
+        frames += struct.unpack(">I", comm[2:6])[0]
+        sound.append(_samples(chunks))
+    comm = first[b"COMM"][:2] + struct.pack(">I", frames) + first[b"COMM"][6:]
+    body = form_type
+    if b"FVER" in first:
+        body += _chunk(b"FVER", first[b"FVER"])
+    body += _chunk(b"COMM", comm)
+    body += _chunk(b"SSND", struct.pack(">II", 0, 0) + b"".join(sound))
+    return _chunk(b"FORM", body)
@@ -0,0 +1,168 @@
+# utils/disk_cache.py
+
+from typing import BinaryIO
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+class DiskCache:
+    """A size-bounded LRU cache of files on local disk.
+
+    Each entry is a plain file, so it can be served or mmapped directly; the
+    index is a SQLite table (memory-mapped reads, WAL) that survives restarts.
+    """
+
+    def __init__(self, path: str, max_bytes: int, mmap_bytes: int = 64 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(path, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                file TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                tag TEXT,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        (self._total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        # Writes interrupted by a crash.
+        for name in os.listdir(path):
+            if name.startswith(".partial-"):
+                os.remove(os.path.join(path, name))
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest())
+
+    def lookup(self, key: str, tag: str = None) -> dict:
+        """Return {path, size, content_type} for key and mark it used, or None; a different tag (e.g. an ETag) is a miss."""
+        with self._lock:
+            row = self._db.execute("SELECT file, size, content_type, tag FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            file, size, content_type, stored_tag = row
+            if (tag is not None and tag != stored_tag) or not os.path.exists(file):
+                self._drop(key, file)
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return {"path": file, "size": size, "content_type": content_type}
+
+    def get(self, key: str, tag: str = None) -> bytes:
+        entry = self.lookup(key, tag)
+        if entry is None:
+            return None
+        try:
+            with open(entry["path"], "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes, content_type: str = None, tag: str = None) -> None:
+        with self.writer(key, content_type, tag) as f:
+            f.write(data)
+
+    def writer(self, key: str, content_type: str = None, tag: str = None) -> "_EntryWriter":
+        """Return a file to write an entry into; it is added to the cache on a clean close and discarded otherwise."""
+        return _EntryWriter(self, key, content_type, tag)
+
+    def _commit(self, key: str, temp_path: str, content_type: str, tag: str) -> None:
+        size = os.path.getsize(temp_path)
+        if size > self.max_bytes:
+            os.remove(temp_path)
+            return
+        file = self._file(key)
+        with self._lock:
+            os.replace(temp_path, file)
+            old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._total += size - (old[0] if old else 0)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, file, size, content_type, tag, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, file, size, content_type, tag, time.time()),
+            )
+            self._evict()
+
+    def _drop(self, key: str, file: str) -> None:
+        row = self._db.execute("DELETE FROM entries WHERE key = ? RETURNING size", (key,)).fetchone()
+        if row:
+            self._total -= row[0]
+        try:
+            os.remove(file)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes:
+            rows = self._db.execute("SELECT key, file FROM entries ORDER BY accessed LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, file in rows:
+                self._drop(key, file)
+                if self._total <= self.max_bytes:
+                    break
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return {"entries": count, "bytes": self._total, "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class _EntryWriter:
+    def __init__(self, cache: DiskCache, key: str, content_type: str, tag: str) -> None:
+        self.cache = cache
+        self.key = key
+        self.content_type = content_type
+        self.tag = tag
+        fd, self.temp_path = tempfile.mkstemp(dir=cache.path, prefix=".partial-")
+        self._file: BinaryIO = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes) -> int:
+        return self._file.write(data)
+
+    def close(self, commit: bool = True) -> None:
+        self._file.close()
+        if commit:
+            self.cache._commit(self.key, self.temp_path, self.content_type, self.tag)
+        elif os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self) -> "_EntryWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> bool:
+        self.close(commit=exc_type is None)
+        return False
+
+class TeeReader:
+    """Wrap a stream so everything read from it is also written to a cache entry.
+
+    The cache is best effort: if writing the copy fails (e.g. a full disk),
+    reading goes on and `failed` is set so the entry is not committed.
+    """
+
+    def __init__(self, stream: BinaryIO, writer: _EntryWriter) -> None:
+        self._stream = stream
+        self._writer = writer
+        self.failed = False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        if data and not self.failed:
+            try:
+                self._writer.write(data)
+            except OSError:
+                self.failed = True
+        return data
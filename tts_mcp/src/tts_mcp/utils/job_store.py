@@ -0,0 +1,72 @@
+# utils/job_store.py
+
+import json
+import sqlite3
+import threading
+import time
+
+class JobStore:
+    """Persist job state in SQLite so submitted jobs and finished results survive a restart."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                request TEXT NOT NULL,
+                url TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+
+    def _row(self, row: tuple) -> dict:
+        id, status, request, url, error, created, updated = row
+        return {"id": id, "status": status, "request": json.loads(request), "url": url, "error": error, "created": created, "updated": updated}
+
+    def get(self, id: str) -> dict:
+        with self._lock:
+            row = self._db.execute("SELECT id, status, request, url, error, created, updated FROM jobs WHERE id = ?", (id,)).fetchone()
+        return self._row(row) if row else None
+
+    def put(self, id: str, request: dict, status: str = QUEUED) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, request, url, error, created, updated) VALUES (?, ?, ?, NULL, NULL, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = excluded.status, request = excluded.request, url = NULL, error = NULL, updated = excluded.updated",
+                (id, status, json.dumps(request), now, now),
+            )
+
+    def update(self, id: str, status: str, url: str = None, error: str = None) -> None:
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = ?, url = ?, error = ?, updated = ? WHERE id = ?", (status, url, error, time.time(), id))
+
+    def pending(self) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, status, request, url, error, created, updated FROM jobs WHERE status IN (?, ?) ORDER BY created",
+                (self.QUEUED, self.RUNNING),
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,201 @@
+# utils/metrics.py
+
+from contextlib import ContextDecorator
+from typing import Callable, Iterable
+import math
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # Optional OpenTelemetry instrument the values are mirrored to.
+        self._otel = None
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        if self._otel is not None:
+            self._otel.add(amount, attributes=self._labels(key))
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in items]
+
+class Gauge(_Metric):
+    """A gauge read from a callback at scrape time; the callback returns {label tuple: value} or a single number."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), callback: Callable[[], object] = None) -> None:
+        super().__init__(name, help, labelnames)
+        self.callback = callback
+
+    def collect(self) -> dict[tuple, float]:
+        if self.callback is None:
+            return {}
+        try:
+            values = self.callback()
+        except Exception:
+            return {}
+        if isinstance(values, dict):
+            return {key if isinstance(key, tuple) else (key,): value for key, value in values.items()}
+        return {(): values}
+
+    def render(self) -> list[str]:
+        return self.header() + [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in self.collect().items()]
+
+class _Timer(ContextDecorator):
+    def __init__(self, histogram: "Histogram", labels: dict) -> None:
+        self.histogram = histogram
+        self.labels = labels
+
+    def _recreate_cm(self) -> "_Timer":
+        # Used as a decorator, every call needs its own start time.
+        return _Timer(self.histogram, self.labels)
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.histogram.observe(time.perf_counter() - self._started, **self.labels)
+        return False
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(set(buckets) | {math.inf}))
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, [[0] * len(self.buckets), 0.0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key][1] = total + value
+        if self._otel is not None:
+            self._otel.record(value, attributes=self._labels(key))
+
+    def time(self, **labels) -> _Timer:
+        """Time a block or function: `with histogram.time(stage="say"):` or `@histogram.time(op="get")`."""
+        return _Timer(self, labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = self.header()
+        for key, counts, total in items:
+            labels = self._labels(key)
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {counts[-1]}")
+        return lines
+
+class Registry:
+    """Collects metrics and renders them in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._meter = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        if self._meter is not None:
+            self._attach_otel(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = (), callback: Callable[[], object] = None) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, callback))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _attach_otel(self, metric: _Metric) -> None:
+        if isinstance(metric, Counter):
+            metric._otel = self._meter.create_counter(metric.name, description=metric.help)
+        elif isinstance(metric, Histogram):
+            metric._otel = self._meter.create_histogram(metric.name, unit="s" if metric.name.endswith("_seconds") else "", description=metric.help)
+        elif isinstance(metric, Gauge):
+            def observe(options, metric=metric):
+                from opentelemetry.metrics import Observation
+                return [Observation(value, metric._labels(key)) for key, value in metric.collect().items()]
+            self._meter.create_observable_gauge(metric.name, callbacks=[observe], description=metric.help)
+
+    def enable_otel(self, meter_name: str = "tts_mcp") -> bool:
+        """Mirror every metric to OpenTelemetry; needs the optional opentelemetry packages."""
+        try:
+            from opentelemetry import metrics as otel_metrics
+        except ImportError:
+            return False
+        self._meter = otel_metrics.get_meter(meter_name)
+        for metric in self._metrics:
+            self._attach_otel(metric)
+        return True
+
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram("tts_stage_seconds", "Time spent in each synthesis pipeline stage.", ["stage"])
+REQUEST_SECONDS = registry.histogram("tts_request_seconds", "End-to-end tool call latency.", ["tool", "outcome"])
+SSH_OPERATION_SECONDS = registry.histogram("tts_ssh_operation_seconds", "Latency of MacSSHClient operations.", ["host", "operation"])
+MINIO_OPERATION_SECONDS = registry.histogram("tts_minio_operation_seconds", "Latency of MinioClient operations.", ["operation"])
+BYTES_TOTAL = registry.counter("tts_bytes_total", "Bytes moved between the server, the Macs and MinIO.", ["direction"])
+CACHE_EVENTS_TOTAL = registry.counter("tts_cache_events_total", "Audio cache lookups by outcome.", ["event"])
+LOCAL_CACHE_EVENTS_TOTAL = registry.counter("tts_local_cache_events_total", "Local disk cache lookups by content kind and outcome.", ["kind", "event"])
+REMOTE_FILES_REMOVED_TOTAL = registry.counter("tts_remote_files_removed_total", "Temporary files removed from the Macs, by how they were removed.", ["mode"])
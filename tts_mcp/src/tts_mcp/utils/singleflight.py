@@ -0,0 +1,94 @@
+# utils/singleflight.py
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, AsyncContextManager, Awaitable, Callable, Hashable
+
+class SingleFlight:
+    """Collapse concurrent calls sharing a key into one execution, for threads and asyncio tasks alike."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            # Mark running so no waiter can cancel the shared future.
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[..., Any], *args, **kwargs) -> None:
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn, *args, **kwargs)
+        return future.result()
+
+    async def _run_gated(self, key: Hashable, future: Future, gate: Callable[[], AsyncContextManager], executor: Executor, call: Callable[[], Any]) -> None:
+        try:
+            async with gate():
+                await asyncio.get_running_loop().run_in_executor(executor, functools.partial(self._run, key, future, call))
+        except BaseException as e:
+            # The gate refused or was interrupted before the call ran.
+            if not future.done():
+                with self._lock:
+                    self._calls.pop(key, None)
+                future.set_exception(e)
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Any], *args, executor: Executor = None, gate: Callable[[], AsyncContextManager] = None, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) run in executor; only the leader of a flight enters gate (e.g. an admission slot) around it."""
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(self._run, key, future, fn, *args, **kwargs)
+            if gate is None:
+                loop.run_in_executor(executor, call)
+            else:
+                # A task of its own, so cancelling the first caller cannot strand callers that joined later.
+                task = loop.create_task(self._run_gated(key, future, gate, executor, functools.partial(fn, *args, **kwargs)))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        # Shield so a cancelled waiter does not cancel the shared flight.
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def _run_coroutine(self, key: Hashable, future: Future, fn: Callable[..., Awaitable[Any]], args: tuple, kwargs: dict) -> None:
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_coroutine(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs), a coroutine function run by the leader in a task of its own; threads calling do() join it too."""
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.get_running_loop().create_task(self._run_coroutine(key, future, fn, args, kwargs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,32 @@
+# utils/text.py
+
+import re
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+")
+
+def split_text(text: str, max_chars: int) -> list[str]:
+    """Split text into chunks of at most max_chars, breaking at paragraphs first and sentences second.
+
+    Paragraphs are never merged, so editing one paragraph leaves the chunks
+    (and their cache keys) of every other paragraph unchanged.
+    """
+    chunks = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+        current = ""
+        for sentence in _SENTENCE_END.split(paragraph):
+            # A single sentence longer than max_chars is kept whole rather than cut mid-word.
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
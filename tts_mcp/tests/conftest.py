@@ -0,0 +1,24 @@
+# tests/conftest.py
+
+import logging
+import uuid
+
+import pytest
+
+@pytest.fixture(scope="session")
+def s3_endpoint():
+    """An in-process S3 stand-in (the bench extra's moto), shared by the MinIO tests."""
+    server_module = pytest.importorskip("moto.server")
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = server_module.ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"{host}:{port}"
+    server.stop()
+
+@pytest.fixture
+def minio_client(s3_endpoint):
+    from tts_mcp.clients import MinioClient
+    client = MinioClient(endpoint=s3_endpoint, access_key="testing", secret_key="testing", secure=False, bucket=f"test-{uuid.uuid4().hex[:12]}")
+    client.create_bucket()
+    return client
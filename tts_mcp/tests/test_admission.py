@@ -0,0 +1,146 @@
+# tests/test_admission.py
+
+import asyncio
+
+import pytest
+
+from tts_mcp.utils import AdmissionController, Overloaded
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+async def _queue(admission, order, waiters):
+    """Start one task per (name, client, priority) that records its name once granted."""
+    async def wait(name, client, priority):
+        await admission.acquire(client, priority)
+        order.append(name)
+
+    tasks = [asyncio.create_task(wait(*waiter)) for waiter in waiters]
+    await _settle()
+    return tasks
+
+async def _grant_all(admission, tasks):
+    for _ in tasks:
+        admission.release()
+        await _settle()
+    await asyncio.gather(*tasks)
+
+def test_grants_up_to_capacity_then_queues():
+    async def main():
+        admission = AdmissionController(lambda: 2)
+        await admission.acquire("a", "interactive")
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("third", "a", "interactive")])
+        assert order == [] and admission.queued() == 1
+        await _grant_all(admission, tasks)
+        assert order == ["third"]
+        assert admission.stats()["in_flight"] == 2
+
+    asyncio.run(main())
+
+def test_interactive_before_bulk():
+    async def main():
+        admission = AdmissionController(lambda: 1)
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("bulk", "a", "bulk"), ("interactive", "b", "interactive")])
+        await _grant_all(admission, tasks)
+        assert order == ["interactive", "bulk"]
+
+    asyncio.run(main())
+
+def test_clients_take_turns_within_a_class():
+    async def main():
+        admission = AdmissionController(lambda: 1)
+        await admission.acquire("a", "bulk")
+        order = []
+        tasks = await _queue(admission, order, [("a1", "a", "bulk"), ("a2", "a", "bulk"), ("a3", "a", "bulk"), ("b1", "b", "bulk")])
+        await _grant_all(admission, tasks)
+        assert order == ["a1", "b1", "a2", "a3"]
+
+    asyncio.run(main())
+
+def test_bulk_is_not_starved():
+    async def main():
+        admission = AdmissionController(lambda: 1, max_streak=2)
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("i1", "a", "interactive"), ("i2", "b", "interactive"), ("bulk", "c", "bulk"), ("i3", "d", "interactive"), ("i4", "e", "interactive")])
+        await _grant_all(admission, tasks)
+        assert order == ["i1", "i2", "bulk", "i3", "i4"]
+
+    asyncio.run(main())
+
+def test_full_queue_raises_overloaded():
+    async def main():
+        admission = AdmissionController(lambda: 1, max_queue=1)
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("queued", "a", "interactive")])
+        with pytest.raises(Overloaded) as raised:
+            await admission.acquire("b", "interactive")
+        assert raised.value.depth == 1
+        assert raised.value.retry_after >= 1
+        with pytest.raises(Overloaded):
+            admission.check()
+        await _grant_all(admission, tasks)
+        assert order == ["queued"]
+
+    asyncio.run(main())
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def main():
+        admission = AdmissionController(lambda: 1)
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("cancelled", "a", "interactive"), ("next", "b", "interactive")])
+        tasks[0].cancel()
+        await _settle()
+        assert admission.queued() == 1
+        await _grant_all(admission, tasks[1:])
+        assert order == ["next"]
+        assert admission.stats()["in_flight"] == 1
+
+    asyncio.run(main())
+
+def test_grant_racing_cancellation_passes_the_slot_on():
+    async def main():
+        admission = AdmissionController(lambda: 1)
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("cancelled", "a", "interactive"), ("next", "b", "interactive")])
+        # The slot goes to the first waiter, which is cancelled before it can run.
+        admission.release()
+        tasks[0].cancel()
+        await _settle()
+        assert tasks[0].cancelled()
+        await asyncio.wait_for(tasks[1], 1)
+        assert order == ["next"]
+        assert admission.stats()["in_flight"] == 1
+        assert admission.queued() == 0
+
+    asyncio.run(main())
+
+def test_slot_releases_on_error():
+    async def main():
+        admission = AdmissionController(lambda: 1)
+        with pytest.raises(RuntimeError):
+            async with admission.slot("a", "interactive"):
+                raise RuntimeError("failed")
+        assert admission.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+
+def test_unknown_priority_is_the_last_class():
+    async def main():
+        admission = AdmissionController(lambda: 1)
+        await admission.acquire("a", "interactive")
+        order = []
+        tasks = await _queue(admission, order, [("unknown", "a", "urgent"), ("interactive", "b", "interactive")])
+        assert admission.stats()["queued"] == {"interactive": 1, "bulk": 1}
+        await _grant_all(admission, tasks)
+        assert order == ["interactive", "unknown"]
+
+    asyncio.run(main())
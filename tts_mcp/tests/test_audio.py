@@ -0,0 +1,62 @@
+# tests/test_audio.py
+
+import struct
+
+import pytest
+
+from tts_mcp.utils import aiff_samples, aiff_stream_header, concat_aiff
+
+# 22.05 kHz as an 80-bit IEEE extended float.
+RATE = b"\x40\x0d\xac\x44\x00\x00\x00\x00\x00\x00"
+
+def make_aiff(samples: bytes, channels: int = 1, sample_size: int = 16) -> bytes:
+    frames = len(samples) // (channels * ((sample_size + 7) // 8))
+    comm = struct.pack(">hIh", channels, frames, sample_size) + RATE
+    sound = struct.pack(">II", 0, 0) + samples
+    body = b"AIFF" + b"COMM" + struct.pack(">I", len(comm)) + comm + b"SSND" + struct.pack(">I", len(sound)) + sound
+    if len(sound) & 1:
+        body += b"\x00"
+    return b"FORM" + struct.pack(">I", len(body)) + body
+
+def frames(data: bytes) -> int:
+    comm = data.index(b"COMM")
+    return struct.unpack(">I", data[comm + 10:comm + 14])[0]
+
+def test_samples_round_trip():
+    assert aiff_samples(make_aiff(b"\x01\x02\x03\x04")) == b"\x01\x02\x03\x04"
+
+def test_rejects_non_aiff():
+    with pytest.raises(ValueError):
+        aiff_samples(b"RIFF\x00\x00\x00\x00WAVE")
+
+def test_concat_joins_samples_and_frames():
+    joined = concat_aiff([make_aiff(b"\x01\x02" * 3), make_aiff(b"\x03\x04" * 5)])
+    assert aiff_samples(joined) == b"\x01\x02" * 3 + b"\x03\x04" * 5
+    assert frames(joined) == 8
+    assert struct.unpack(">I", joined[4:8])[0] == len(joined) - 8
+
+def test_concat_handles_odd_sized_parts():
+    # 8-bit mono with an odd frame count pads SSND to an even length.
+    parts = [make_aiff(b"\x01\x02\x03", sample_size=8), make_aiff(b"\x04", sample_size=8)]
+    joined = concat_aiff(parts)
+    assert aiff_samples(joined) == b"\x01\x02\x03\x04"
+    assert frames(joined) == 4
+
+def test_concat_rejects_mixed_formats():
+    with pytest.raises(ValueError):
+        concat_aiff([make_aiff(b"\x00" * 4), make_aiff(b"\x00" * 4, channels=2)])
+    with pytest.raises(ValueError):
+        concat_aiff([])
+
+def test_stream_header_keeps_format_and_whole_frames():
+    part = make_aiff(b"\x00" * 8, channels=2)
+    header = aiff_stream_header(part)
+    assert header.startswith(b"FORM") and header[8:12] == b"AIFF"
+    comm = header.index(b"COMM")
+    channels, _, sample_size = struct.unpack(">hIh", header[comm + 8:comm + 16])
+    assert (channels, sample_size) == (2, 16)
+    # The sizes promise a whole number of frames right after the header.
+    sound_size = struct.unpack(">I", header[4:8])[0] + 8 - len(header)
+    assert sound_size % 4 == 0
+    assert sound_size == frames(header) * 4
+    assert struct.unpack(">I", header[4:8])[0] <= 0xFFFFFFFF
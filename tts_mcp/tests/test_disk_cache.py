@@ -0,0 +1,98 @@
+# tests/test_disk_cache.py
+
+import io
+import itertools
+import os
+
+import pytest
+
+import tts_mcp.utils.disk_cache as disk_cache
+from tts_mcp.utils import DiskCache, TeeReader
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Distinct access times, so LRU order does not depend on the clock's resolution.
+    ticks = itertools.count(1)
+    monkeypatch.setattr(disk_cache.time, "time", lambda: float(next(ticks)))
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=10)
+    yield cache
+    cache.close()
+
+def partial_files(cache):
+    return [name for name in os.listdir(cache.path) if name.startswith(".partial-")]
+
+def test_put_and_get(cache):
+    cache.put("a", b"1234", content_type="audio/aiff")
+    assert cache.get("a") == b"1234"
+    entry = cache.lookup("a")
+    assert entry["size"] == 4 and entry["content_type"] == "audio/aiff"
+    assert cache.get("missing") is None
+
+def test_evicts_least_recently_used(cache):
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.stats() == {"entries": 2, "bytes": 8, "max_bytes": 10}
+
+def test_replacing_an_entry_counts_its_size_once(cache):
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aaaaaa")
+    assert cache.stats()["bytes"] == 6
+
+def test_oversized_entry_is_not_kept(cache):
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 0
+    assert partial_files(cache) == []
+
+def test_tag_mismatch_is_a_miss_and_drops_the_entry(cache):
+    cache.put("text", b"old", tag="etag-1")
+    assert cache.get("text", tag="etag-1") == b"old"
+    assert cache.get("text", tag="etag-2") is None
+    assert cache.get("text") is None
+    assert cache.stats()["entries"] == 0
+
+def test_missing_file_is_a_miss(cache):
+    cache.put("a", b"aaaa")
+    os.remove(cache.lookup("a")["path"])
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+def test_writer_discards_on_error(cache):
+    with pytest.raises(RuntimeError):
+        with cache.writer("a") as writer:
+            writer.write(b"half")
+            raise RuntimeError("upload failed")
+    assert cache.get("a") is None
+    assert partial_files(cache) == []
+
+def test_tee_reader_commits_what_was_read(cache):
+    writer = cache.writer("a", "audio/aiff")
+    reader = TeeReader(io.BytesIO(b"streamed"), writer)
+    while reader.read(3):
+        pass
+    writer.close(commit=True)
+    assert cache.get("a") == b"streamed"
+
+def test_index_survives_reopen_and_partials_are_cleared(tmp_path, clock):
+    path = str(tmp_path / "cache")
+    cache = DiskCache(path, max_bytes=10)
+    cache.put("a", b"aaaa")
+    # As if the process died mid-write.
+    writer = cache.writer("b")
+    writer.write(b"interrupted")
+    writer._file.close()
+    cache.close()
+    reopened = DiskCache(path, max_bytes=10)
+    try:
+        assert reopened.get("a") == b"aaaa"
+        assert reopened.stats()["bytes"] == 4
+        assert partial_files(reopened) == []
+    finally:
+        reopened.close()
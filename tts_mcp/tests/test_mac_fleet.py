@@ -0,0 +1,161 @@
+# tests/test_mac_fleet.py
+
+import io
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+import tts_mcp.clients.mac_fleet as mac_fleet
+from tts_mcp.clients import MacCommandError, MacFleet, MacPoolTimeout, MacStream, MacTransportError
+from tts_mcp.utils import CircuitBreaker, Overloaded
+
+class FakePool:
+    """Stands in for MacSSHPool; the job function gets the pool itself as its client."""
+
+    down: set[str] = set()
+
+    def __init__(self, host, port, size=4, connect=True, **kwargs):
+        self.host = host
+        self.id = f"{host}:{port}"
+        self.size = size
+        if connect and host in self.down:
+            raise MacTransportError(f"Failed to connect to Mac '{self.id}'")
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def stats(self):
+        return {}
+
+    def close(self):
+        pass
+
+@pytest.fixture(autouse=True)
+def fake_pool(monkeypatch):
+    FakePool.down = set()
+    monkeypatch.setattr(mac_fleet, "MacSSHPool", FakePool)
+
+def fleet(hosts=("mac1", "mac2"), **kwargs):
+    kwargs.setdefault("max_attempts", 2)
+    kwargs.setdefault("failure_threshold", 2)
+    kwargs.setdefault("reset_timeout", 60)
+    return MacFleet(list(hosts), "user", password="password", **kwargs)
+
+def worker(macs, host):
+    return next(w for w in macs.workers if w.host == host)
+
+def test_transport_error_retries_on_another_mac():
+    macs = fleet()
+    tried = []
+
+    def job(client):
+        tried.append(client.host)
+        if len(tried) == 1:
+            raise MacTransportError("link dropped")
+        return client.host
+
+    result = macs.run(job)
+    assert result == tried[1] and tried[0] != tried[1]
+    failed = worker(macs, tried[0])
+    assert failed.failed == 1 and failed.outstanding == 0
+    assert worker(macs, tried[1]).completed == 1
+
+@pytest.mark.parametrize("error", [MacCommandError(1, "Voice not found"), RuntimeError("Failed to upload audio to MinIO"), OSError(28, "No space left on device")])
+def test_other_errors_are_raised_without_retry_or_breaker(error):
+    macs = fleet()
+    calls = []
+
+    def job(client):
+        calls.append(client.host)
+        raise error
+
+    for _ in range(3):
+        with pytest.raises(type(error)):
+            macs.run(job)
+    assert len(calls) == 3
+    assert all(w.breaker.state == CircuitBreaker.CLOSED for w in macs.workers)
+    # The fleet still serves jobs.
+    assert macs.run(lambda client: "ok") == "ok"
+
+def test_breaker_opens_after_repeated_transport_failures():
+    macs = fleet(hosts=("mac1",), max_attempts=1)
+
+    def job(client):
+        raise MacTransportError("link dropped")
+
+    for _ in range(2):
+        with pytest.raises(MacTransportError):
+            macs.run(job)
+    assert worker(macs, "mac1").breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ConnectionError, match="No Mac host is available"):
+        macs.run(lambda client: "ok")
+
+def test_unreachable_mac_starts_out_of_rotation():
+    FakePool.down = {"mac1"}
+    macs = fleet()
+    assert worker(macs, "mac1").breaker.state == CircuitBreaker.OPEN
+    assert [macs.run(lambda client: client.host) for _ in range(3)] == ["mac2"] * 3
+    FakePool.down = {"mac1", "mac2"}
+    with pytest.raises(ConnectionError):
+        fleet()
+
+def test_busy_pool_moves_on_without_tripping_the_breaker():
+    macs = fleet()
+    busy = []
+
+    def job(client):
+        if not busy:
+            busy.append(client.host)
+            raise MacPoolTimeout("all connections in use")
+        return client.host
+
+    assert macs.run(job) != busy[0]
+    assert all(w.breaker.state == CircuitBreaker.CLOSED and w.failed == 0 for w in macs.workers)
+
+def test_every_pool_busy_is_overloaded():
+    macs = fleet()
+
+    def job(client):
+        raise MacPoolTimeout("all connections in use")
+
+    with pytest.raises(Overloaded):
+        macs.run(job)
+    assert all(w.outstanding == 0 for w in macs.workers)
+
+def test_job_limit_wait_times_out_as_overloaded():
+    macs = fleet(hosts=("mac1",), max_inflight=1, checkout_timeout=0.2)
+    started, release = threading.Event(), threading.Event()
+
+    def hold(client):
+        started.set()
+        release.wait(5)
+
+    holder = threading.Thread(target=macs.run, args=(hold,))
+    holder.start()
+    started.wait(5)
+    try:
+        with pytest.raises(Overloaded) as raised:
+            macs.run(lambda client: "ok")
+        assert raised.value.retry_after >= 1
+    finally:
+        release.set()
+        holder.join()
+    assert macs.run(lambda client: "ok") == "ok"
+
+class BrokenStream(io.BytesIO):
+    def read(self, size=-1):
+        raise EOFError("channel closed")
+
+def test_mac_stream_read_errors_are_transport_errors():
+    with pytest.raises(MacTransportError):
+        MacStream(BrokenStream(), "mac1:22").read(10)
+    assert MacStream(io.BytesIO(b"audio"), "mac1:22").read() == b"audio"
+
+def test_upload_passes_on_a_mac_read_error(minio_client):
+    # A Mac that dies mid-transfer must reach the fleet as a transport error, not a failed upload.
+    with pytest.raises(MacTransportError):
+        minio_client.upload_stream(MacStream(BrokenStream(), "mac1:22"), 10, "audio/broken.aiff")
+    assert minio_client.upload_stream(io.BytesIO(b"audio"), 5, "audio/ok.aiff") is True
+    assert minio_client.upload_stream(io.BytesIO(b"audio"), 5, "audio/ok.aiff", bucket="missing-bucket") is False
@@ -0,0 +1,43 @@
+# tests/test_minio.py
+
+import io
+import time
+
+def put(client, name, size=10):
+    assert client.upload_stream(io.BytesIO(b"x" * size), size, name)
+
+def names(client, prefix=""):
+    return sorted(obj["name"] for obj in client.iter_objects(prefix))
+
+def test_prune_prefix_is_a_folder(minio_client):
+    put(minio_client, "tmp/a.aiff")
+    put(minio_client, "tmp2/b.aiff")
+    put(minio_client, "tmpfile.aiff")
+    result = minio_client.prune("tmp", max_age=0)
+    assert result["scanned"] == 1 and result["removed"] == 1
+    assert names(minio_client) == ["tmp2/b.aiff", "tmpfile.aiff"]
+
+def test_prune_only_considers_matching_names(minio_client):
+    put(minio_client, "audio/abc.aiff")
+    put(minio_client, "audio/abc.part3.aiff")
+    put(minio_client, "audio/nested/def.aiff")
+    result = minio_client.prune("audio", max_age=0, pattern=r"[0-9a-f]+\.aiff$")
+    assert result["scanned"] == 1
+    assert names(minio_client) == ["audio/abc.part3.aiff", "audio/nested/def.aiff"]
+
+def test_prune_max_bytes_evicts_oldest_first(minio_client):
+    for name in ("oldest", "older", "newer", "newest"):
+        put(minio_client, f"cache/{name}.aiff", size=100)
+        time.sleep(1.1)  # S3 timestamps have one second resolution.
+    result = minio_client.prune("cache", max_bytes=250)
+    assert result == {"scanned": 4, "removed": 2, "freed_bytes": 200}
+    assert names(minio_client) == ["cache/newer.aiff", "cache/newest.aiff"]
+
+def test_prune_max_age_keeps_recent_objects(minio_client):
+    put(minio_client, "cache/old.aiff")
+    time.sleep(2.1)
+    put(minio_client, "cache/new.aiff")
+    result = minio_client.prune("cache", max_age=1.5)
+    assert result["removed"] == 1
+    assert names(minio_client) == ["cache/new.aiff"]
+    assert minio_client.prune("cache", max_age=3600, max_bytes=10)["removed"] == 0
@@ -0,0 +1,142 @@
+# tests/test_singleflight.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import pytest
+
+from tts_mcp.utils import Overloaded, SingleFlight
+
+def test_threads_share_one_call():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "done"
+
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(flights.do, "key", work)
+        started.wait()
+        rest = [pool.submit(flights.do, "key", work) for _ in range(3)]
+        results = [first.result()] + [future.result() for future in rest]
+    assert results == ["done"] * 4
+    assert len(calls) == 1
+    assert flights.in_flight() == 0
+
+def test_tasks_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    def work(value):
+        calls.append(value)
+        time.sleep(0.05)
+        return value * 2
+
+    async def main():
+        return await asyncio.gather(*[flights.do_async("key", work, 21) for _ in range(5)])
+
+    assert asyncio.run(main()) == [42] * 5
+    assert calls == [21]
+
+def test_exception_reaches_every_caller():
+    flights = SingleFlight()
+
+    def work():
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*[flights.do_async("key", work) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.in_flight() == 0
+
+def test_cancelled_leader_does_not_strand_followers():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    @asynccontextmanager
+    async def gate():
+        yield
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(flights.do_async("key", work, gate=gate))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(flights.do_async("key", work, gate=gate))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        release.set()
+        return await follower
+
+    assert asyncio.run(main()) == "done"
+    assert calls == [1]
+    assert flights.in_flight() == 0
+
+def test_gate_refusal_fails_the_flight_without_running_it():
+    flights = SingleFlight()
+    calls = []
+
+    @asynccontextmanager
+    async def refuse():
+        raise Overloaded(5, 10)
+        yield
+
+    @asynccontextmanager
+    async def admit():
+        yield
+
+    def work():
+        calls.append(1)
+        return "done"
+
+    async def main():
+        results = await asyncio.gather(*[flights.do_async("key", work, gate=refuse) for _ in range(3)], return_exceptions=True)
+        # The refused flight is gone, so the next caller starts a fresh one.
+        retried = await flights.do_async("key", work, gate=admit)
+        return results, retried
+
+    results, retried = asyncio.run(main())
+    assert all(isinstance(result, Overloaded) for result in results)
+    assert results[0].retry_after == 5
+    assert retried == "done"
+    assert calls == [1]
+    assert flights.in_flight() == 0
+
+def test_coroutine_flight_is_shared_and_survives_a_cancelled_caller():
+    flights = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value * 2
+
+    async def main():
+        leader = asyncio.create_task(flights.do_coroutine("key", work, 21))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flights.do_coroutine("key", work, 21)) for _ in range(2)]
+        # A thread joining with do() waits on the same flight.
+        thread = asyncio.get_running_loop().run_in_executor(None, flights.do, "key", lambda: "not run")
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(*followers, thread)
+
+    assert asyncio.run(main()) == [42, 42, 42]
+    assert calls == [21]
+    assert flights.in_flight() == 0
@@ -0,0 +1,45 @@
+# tests/test_stream.py
+
+import asyncio
+
+import tts_mcp.config as config
+import tts_mcp.tools.stream as stream
+from tts_mcp.tools.stream import AudioStream
+
+def job(hash):
+    return stream.AudioJob(f"text {hash}", hash, "Samantha", 200, "aiff", 0, f"tts/{hash}.aiff", f"http://minio/tts/{hash}.aiff")
+
+def test_stalled_segment_finishes_the_stream_with_an_error(monkeypatch):
+    async def stalled(segment, use_cache):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(stream, "_resolve_async", stalled)
+    monkeypatch.setattr(config, "TTS_STREAM_SEGMENT_TIMEOUT", 0.1)
+
+    async def main():
+        audio_stream = AudioStream(job("whole"), [job("first"), job("second")])
+        audio_stream._task = asyncio.create_task(audio_stream.run())
+        assert not await asyncio.wait_for(audio_stream.ready(), 5)
+        assert "tts/first.aiff" in audio_stream.error
+        assert [part async for part in audio_stream.read()] == []
+        await audio_stream._task
+
+    asyncio.run(main())
+
+def test_cancelled_stream_releases_its_listeners(monkeypatch):
+    async def stalled(segment, use_cache):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(stream, "_resolve_async", stalled)
+    monkeypatch.setattr(config, "TTS_STREAM_SEGMENT_TIMEOUT", 0)
+
+    async def main():
+        audio_stream = AudioStream(job("whole"), [job("first")])
+        audio_stream._task = asyncio.create_task(audio_stream.run())
+        listener = asyncio.create_task(audio_stream.ready())
+        await asyncio.sleep(0.05)
+        audio_stream._task.cancel()
+        assert not await asyncio.wait_for(listener, 5)
+        assert audio_stream.done and audio_stream.error
+
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+# tests/test_text.py
+
+from tts_mcp.utils import split_text
+
+def test_short_text_is_one_chunk():
+    assert split_text("Hello there.", 100) == ["Hello there."]
+
+def test_paragraphs_are_never_merged():
+    assert split_text("One.\n\nTwo.\n \n\nThree.", 100) == ["One.", "Two.", "Three."]
+
+def test_long_paragraph_breaks_at_sentences():
+    text = "First sentence here. Second one! Third one? Fourth."
+    chunks = split_text(text, 25)
+    assert chunks == ["First sentence here.", "Second one! Third one?", "Fourth."]
+    assert all(len(chunk) <= 25 for chunk in chunks)
+
+def test_overlong_sentence_is_kept_whole():
+    sentence = "This sentence is much longer than the limit allows."
+    assert split_text(f"Short. {sentence} End.", 20) == ["Short.", sentence, "End."]
+
+def test_editing_one_paragraph_keeps_the_others():
+    before = split_text("Alpha beta.\n\nGamma delta.", 100)
+    after = split_text("Alpha beta, edited.\n\nGamma delta.", 100)
+    assert before[1] == after[1]
+
+def test_blank_text_has_no_chunks():
+    assert split_text(" \n\n ", 10) == []